@@ -1,5 +1,5 @@
 import requests
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass
 import time
 import json
@@ -164,6 +164,10 @@ class RobustApiClient:
         """Crear nuevo shipment"""
         return self.post("/shipments", data=shipment_data)
 
+    def create_shipments_bulk(self, shipments: List[Dict]) -> ApiResponse:
+        """Crear varios shipments en una sola petición"""
+        return self.post("/shipments/bulk", data=shipments)
+
     def update_shipment(self, shipment_id: int, data: Dict, current_version: int = None) -> ApiResponse:
         """Actualizar shipment con control de versión opcional"""
         if current_version is not None:
@@ -1,8 +1,9 @@
 """Utility functions to query Mie Trak directly from the client."""
 
-from typing import Any, List
+from typing import List
 import pymssql
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -11,6 +12,10 @@ DEFAULT_MIE_TRAK_DATABASE = "GunderlinLive"
 DEFAULT_MIE_TRAK_USER = "mie"
 DEFAULT_MIE_TRAK_PASSWORD = "mie"
 
+# Las direcciones de un sales order casi nunca cambian: se cachean en memoria
+ADDRESS_CACHE_TTL_SECONDS = 3600
+_address_cache: dict[tuple[str, str, str], tuple[float, str]] = {}
+
 
 def _connect_to_mie_trak(server: str, database: str):
     return pymssql.connect(
@@ -49,6 +54,16 @@ def get_mie_trak_databases(server: str = DEFAULT_MIE_TRAK_SERVER) -> list[str]:
                 pass
 
 
+def invalidate_mie_trak_address_cache(job_number: str | None = None) -> None:
+    """Drop cached addresses for *job_number*, or all of them when omitted."""
+    if job_number is None:
+        _address_cache.clear()
+        return
+    base_number = str(job_number).strip().split(".", 1)[0]
+    for key in [key for key in _address_cache if key[2] == base_number]:
+        _address_cache.pop(key, None)
+
+
 def get_mie_trak_address(
     job_number: str,
     *,
@@ -58,7 +73,8 @@ def get_mie_trak_address(
     """Return the shipping address for a given job number.
 
     This function connects directly to the Mie Trak database, queries the
-    address information and closes the connection before returning.
+    address information and closes the connection before returning. Found
+    addresses are cached for ``ADDRESS_CACHE_TTL_SECONDS``.
     """
     raw_job_number = job_number
     cleaned_job_number = str(job_number).strip()
@@ -68,35 +84,38 @@ def get_mie_trak_address(
     if "." in cleaned_job_number:
         cleaned_job_number = cleaned_job_number.split(".", 1)[0]
 
-    variants: List[Any] = [cleaned_job_number]
+    cache_key = (server, database, cleaned_job_number)
+    cached = _address_cache.get(cache_key)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Solo parámetros str: mezclar un int en el IN obliga a SQL Server a
+    # convertir la columna y pierde el index seek
+    variants: List[str] = [cleaned_job_number]
     if cleaned_job_number.isdigit():
-        variants.extend([
-            cleaned_job_number.zfill(len(cleaned_job_number) + 1),
-            int(cleaned_job_number),
-        ])
-    variants = list(dict.fromkeys(variants))
+        variants.append("0" + cleaned_job_number)
 
     conn = None
     try:
         conn = _connect_to_mie_trak(server=server, database=database)
         cursor = conn.cursor(as_dict=True)
 
+        # All variants in a single round trip instead of one query per variant
+        placeholders = ", ".join(["%s"] * len(variants))
         query = (
-            """
-            SELECT ShippingAddress1, ShippingAddress2,
+            f"""
+            SELECT TOP 1 ShippingAddress1, ShippingAddress2,
                    ShippingAddressCity, ShippingAddressStateDescription,
                    ShippingAddressZipCode
             FROM SalesOrder
-            WHERE SalesOrderPK = %s
+            WHERE SalesOrderPK IN ({placeholders})
+            ORDER BY CASE WHEN SalesOrderPK = %s THEN 0 ELSE 1 END
             """
         )
 
-        row = None
-        for variant in variants:
-            cursor.execute(query, (variant,))
-            row = cursor.fetchone()
-            if row:
-                break
+        # Preferir la coincidencia exacta sobre la variante con cero a la izquierda
+        cursor.execute(query, (*variants, cleaned_job_number))
+        row = cursor.fetchone()
 
         if not row:
             raise ValueError(
@@ -109,7 +128,9 @@ def get_mie_trak_address(
             f"{row.get('ShippingAddressZipCode')}"
         )
         address_parts.append(city_line)
-        return "\n".join(part for part in address_parts if part)
+        address = "\n".join(part for part in address_parts if part)
+        _address_cache[cache_key] = (time.monotonic() + ADDRESS_CACHE_TTL_SECONDS, address)
+        return address
 
     finally:
         if conn:
@@ -16,6 +16,10 @@ class WebSocketClient(QThread):
     
     def run(self):
         def on_message(ws, message):
+            # El servidor envía frames de texto; se toleran frames binarios
+            # (JSON UTF-8) por si algún servidor los usa
+            if isinstance(message, bytes):
+                message = message.decode("utf-8")
             self.message_received.emit(message)
         
         def on_error(ws, error):
@@ -3978,6 +3978,10 @@ class ModernShippingMainWindow(QMainWindow):
                         self.show_toast(f"Shipment updated: Job #{job_number}")
                     elif msg_type == "shipment_deleted":
                         self.show_toast(f"Shipment deleted: Job #{job_number}")
+            elif msg_type == "shipments_bulk":
+                self.load_shipments_async()
+                if not self._is_action_from_current_user(data["data"].get("action_by", "User")):
+                    self.show_toast(f"{len(data['data'].get('ids', []))} new shipments created")
                     
         except json.JSONDecodeError:
             pass
@@ -11,22 +11,125 @@ from PyQt6.QtWidgets import (
     QHeaderView,
 )
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .widgets import ModernButton, ModernLineEdit, ModernComboBox, ProfessionalCard
 from core.config import get_server_url, REQUEST_TIMEOUT, MODERN_FONT
 from .utils import apply_scaled_font, get_base_font_size
 
 
+# Hojas de estilo compartidas; solo los tamaños de fuente se formatean por uso
+_ERROR_MSGBOX_QSS = """
+    QMessageBox {{
+        background: #FFFFFF;
+        font-family: '{font_family}';
+    }}
+    QMessageBox QLabel {{
+        color: #374151;
+        font-size: {label_size}px;
+        padding: 8px;
+    }}
+    QMessageBox QPushButton {{
+        background: #3B82F6;
+        color: white;
+        border: none;
+        padding: 6px 20px;
+        border-radius: 6px;
+        font-weight: 500;
+        font-size: {button_size}px;
+        min-width: 80px;
+    }}
+    QMessageBox QPushButton:hover {{
+        background: #2563EB;
+    }}
+"""
+
+_USER_TABLE_HEADER_QSS = """
+    QHeaderView::section {{
+        background-color: #E5E5E5;
+        color: #000000;
+        padding: 8px 4px;
+        border: none;
+        border-right: 1px solid #D1D5DB;
+        font-size: {header_size}px;
+        font-weight: 600;
+    }}
+"""
+
+class UserRequestSignals(QObject):
+    """Señales emitidas por UserRequestTask hacia el hilo de la UI"""
+    response_ready = pyqtSignal(object)
+    error_occurred = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class UserRequestTask(QRunnable):
+    """Tarea del pool de hilos para ejecutar requests de usuarios sin bloquear la UI"""
+
+    def __init__(self, method, url, headers, payload=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = UserRequestSignals()
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.payload = payload
+
+    def run(self):
+        try:
+            resp = _SESSION.request(
+                self.method,
+                self.url,
+                json=self.payload,
+                headers=self.headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            self.signals.response_ready.emit(resp)
+        except Exception as e:
+            self.signals.error_occurred.emit(str(e))
+        finally:
+            self.signals.finished.emit()
+
+
+# Tareas en vuelo; se mantienen vivas aunque el dialogo que las lanzo se cierre
+_ACTIVE_REQUESTS: set = set()
+# Sesion compartida para reutilizar conexiones keep-alive entre requests; el pool
+# se dimensiona al QThreadPool para que las tareas concurrentes no descarten conexiones
+_SESSION = requests.Session()
+_POOL_SIZE = max(10, QThreadPool.globalInstance().maxThreadCount())
+_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_POOL_SIZE))
+
+
+def _start_user_request(owner, method, path, on_response, payload=None, on_finished=None):
+    """Queue a request against the users API on the global thread pool."""
+    task = UserRequestTask(
+        method,
+        f"{get_server_url()}{path}",
+        owner._auth_headers,
+        payload,
+    )
+    task.signals.response_ready.connect(on_response)
+    task.signals.error_occurred.connect(owner.show_error)
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    task.signals.finished.connect(lambda: _ACTIVE_REQUESTS.discard(task))
+    _ACTIVE_REQUESTS.add(task)
+    QThreadPool.globalInstance().start(task)
+
+
 class UserFormDialog(QDialog):
     """Dialogo para crear o editar usuarios"""
 
     def __init__(self, token, user=None):
         super().__init__()
         self.token = token
+        self._auth_headers = {"Authorization": f"Bearer {token}"}
         self.user = user or {}
+        self._error_msg = None
         self.setWindowTitle("Edit User" if user else "Create User")
         self.setMinimumSize(400, 300)
         self.setup_ui()
@@ -56,11 +159,11 @@ class UserFormDialog(QDialog):
         card.add_layout(form_layout)
 
         button_layout = QHBoxLayout()
-        save_btn = ModernButton("Save", "primary")
+        self.save_btn = ModernButton("Save", "primary")
         cancel_btn = ModernButton("Cancel", "secondary")
-        save_btn.clicked.connect(self.save)
+        self.save_btn.clicked.connect(self.save)
         cancel_btn.clicked.connect(self.reject)
-        button_layout.addWidget(save_btn)
+        button_layout.addWidget(self.save_btn)
         button_layout.addWidget(cancel_btn)
 
         layout.addWidget(card)
@@ -79,78 +182,61 @@ class UserFormDialog(QDialog):
         self.role_combo.setCurrentText(user.get("role", "read"))
 
     def save(self):
+        fields = {
+            key: getattr(self, f"{key}_edit").text().strip()
+            for key in ("username", "email", "password")
+        }
+        if not fields["username"] or not fields["email"]:
+            self.show_error("Username and email are required")
+            return
+        if not self.user and not fields["password"]:
+            self.show_error("Password is required")
+            return
         data = {
-            "username": self.username_edit.text().strip(),
-            "email": self.email_edit.text().strip(),
+            "username": fields["username"],
+            "email": fields["email"],
             "role": self.role_combo.currentText(),
         }
-        password = self.password_edit.text().strip()
-        if password:
-            data["password"] = password
-        if not data["username"] or not data["email"]:
-            self.show_error("Username and email are required")
+        if fields["password"]:
+            data["password"] = fields["password"]
+        if self.user:
+            method, path = "PUT", f"/users/{self.user['id']}"
+        else:
+            method, path = "POST", "/users"
+        self.save_btn.setEnabled(False)
+        _start_user_request(
+            self, method, path, self._on_save_response, data, on_finished=self._on_save_finished
+        )
+
+    def _on_save_finished(self):
+        self.save_btn.setEnabled(True)
+
+    def _on_save_response(self, resp):
+        if resp.ok:
+            self.accept()
             return
-        headers = {"Authorization": f"Bearer {self.token}"}
         try:
-            server_url = get_server_url()
-            if self.user:
-                resp = requests.put(
-                    f"{server_url}/users/{self.user['id']}",
-                    json=data,
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT,
-                )
-            else:
-                data["password"] = password
-                resp = requests.post(
-                    f"{server_url}/users",
-                    json=data,
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT,
-                )
-            if resp.status_code in (200, 201):
-                self.accept()
-            else:
-                msg = resp.json().get("detail", resp.text)
-                self.show_error(msg)
-        except Exception as e:
-            self.show_error(str(e))
+            detail = resp.json().get("detail")
+        except (ValueError, AttributeError):
+            detail = None
+        self.show_error(str(detail or resp.text))
 
     def show_error(self, message):
-        msg = QMessageBox(self)
-        msg.setIcon(QMessageBox.Icon.Critical)
-        msg.setWindowTitle("Error")
-        msg.setText(message)
-        base = get_base_font_size()
-        label_size = max(8, base + 3)
-        button_size = max(8, base + 2)
-        msg.setStyleSheet(
-            f"""
-            QMessageBox {{
-                background: #FFFFFF;
-                font-family: '{MODERN_FONT}';
-            }}
-            QMessageBox QLabel {{
-                color: #374151;
-                font-size: {label_size}px;
-                padding: 8px;
-            }}
-            QMessageBox QPushButton {{
-                background: #3B82F6;
-                color: white;
-                border: none;
-                padding: 6px 20px;
-                border-radius: 6px;
-                font-weight: 500;
-                font-size: {button_size}px;
-                min-width: 80px;
-            }}
-            QMessageBox QPushButton:hover {{
-                background: #2563EB;
-            }}
-        """
-        )
-        msg.exec()
+        if self._error_msg is None:
+            # Se construye y estiliza una sola vez; los errores siguientes solo cambian el texto
+            self._error_msg = QMessageBox(self)
+            self._error_msg.setIcon(QMessageBox.Icon.Critical)
+            self._error_msg.setWindowTitle("Error")
+            base = get_base_font_size()
+            self._error_msg.setStyleSheet(
+                _ERROR_MSGBOX_QSS.format(
+                    font_family=MODERN_FONT,
+                    label_size=max(8, base + 3),
+                    button_size=max(8, base + 2),
+                )
+            )
+        self._error_msg.setText(message)
+        self._error_msg.exec()
 
 
 class UserManagementDialog(QDialog):
@@ -172,6 +258,8 @@ class UserManagementWidget(QWidget):
     def __init__(self, token, parent=None):
         super().__init__(parent)
         self.token = token
+        self._auth_headers = {"Authorization": f"Bearer {token}"}
+        self._error_msg = None
         self.setup_ui()
         self.load_users()
 
@@ -186,19 +274,7 @@ class UserManagementWidget(QWidget):
         self.table.verticalHeader().setDefaultSectionSize(40)
         self.table.verticalHeader().setMinimumSectionSize(40)
         header_font = max(8, get_base_font_size() + 3)
-        self.table.setStyleSheet(
-            f"""
-    QHeaderView::section {{
-        background-color: #E5E5E5;
-        color: #000000;
-        padding: 8px 4px;
-        border: none;
-        border-right: 1px solid #D1D5DB;
-        font-size: {header_font}px;
-        font-weight: 600;
-    }}
-        """
-        )
+        self.table.setStyleSheet(_USER_TABLE_HEADER_QSS.format(header_size=header_font))
         layout.addWidget(self.table)
 
         btn_layout = QHBoxLayout()
@@ -214,10 +290,10 @@ class UserManagementWidget(QWidget):
         layout.addLayout(btn_layout)
 
     def load_users(self):
-        headers = {"Authorization": f"Bearer {self.token}"}
+        _start_user_request(self, "GET", "/users", self._on_users_loaded)
+
+    def _on_users_loaded(self, resp):
         try:
-            server_url = get_server_url()
-            resp = requests.get(f"{server_url}/users", headers=headers, timeout=REQUEST_TIMEOUT)
             if resp.status_code == 200:
                 users = resp.json()
                 self.table.setRowCount(len(users))
@@ -250,12 +326,6 @@ class UserManagementWidget(QWidget):
         if dlg.exec() == QDialog.DialogCode.Accepted:
             self.load_users()
 
-    def _create_form_label(self, text: str) -> QLabel:
-        label = QLabel(text)
-        apply_scaled_font(label, offset=1, weight=QFont.Weight.Medium)
-        label.setStyleSheet("color: #374151;")
-        return label
-
     def edit_user(self):
         user = self.get_selected_user()
         if not user:
@@ -276,24 +346,18 @@ class UserManagementWidget(QWidget):
             f"Delete user {user['username']}?",
         )
         if msg == QMessageBox.StandardButton.Yes:
-            headers = {"Authorization": f"Bearer {self.token}"}
-            try:
-                server_url = get_server_url()
-                resp = requests.delete(
-                    f"{server_url}/users/{user['id']}",
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                if resp.status_code == 200:
-                    self.load_users()
-                else:
-                    self.show_error(resp.text)
-            except Exception as e:
-                self.show_error(str(e))
+            _start_user_request(self, "DELETE", f"/users/{user['id']}", self._on_user_deleted)
+
+    def _on_user_deleted(self, resp):
+        if resp.ok:
+            self.load_users()
+        else:
+            self.show_error(resp.text)
 
     def show_error(self, message):
-        msg = QMessageBox(self)
-        msg.setIcon(QMessageBox.Icon.Critical)
-        msg.setWindowTitle("Error")
-        msg.setText(message)
-        msg.exec()
+        if self._error_msg is None:
+            self._error_msg = QMessageBox(self)
+            self._error_msg.setIcon(QMessageBox.Icon.Critical)
+            self._error_msg.setWindowTitle("Error")
+        self._error_msg.setText(message)
+        self._error_msg.exec()
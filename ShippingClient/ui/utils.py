@@ -1,4 +1,7 @@
 # ui/utils.py
+from functools import lru_cache
+
+from PyQt6 import sip
 from PyQt6.QtWidgets import QApplication, QLabel, QWidget
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import QTimer, Qt, QPoint
@@ -6,12 +9,46 @@ from PyQt6.QtCore import QTimer, Qt, QPoint
 from core.config import MODERN_FONT
 
 
+# Solo colores y espaciado; la fuente del toast se asigna con QFont
+_TOAST_QSS_TEMPLATE = """
+    QLabel {{
+        background-color: {color};
+        color: white;
+        padding: 12px 22px;
+        border-radius: 10px;
+    }}
+"""
+
+_BASE_SIZE_CACHE: int | None = None
+_FONT_SIGNAL_APP = None
+
+
+def invalidate_base_font_size() -> None:
+    """Forget the cached application font size so the next lookup re-reads it."""
+    global _BASE_SIZE_CACHE
+    _BASE_SIZE_CACHE = None
+
+
+def _watch_app_font(app) -> None:
+    """Connect the application's fontChanged signal to the cache invalidation once."""
+    global _FONT_SIGNAL_APP
+    if _FONT_SIGNAL_APP is app:
+        return
+    app.fontChanged.connect(lambda _font: invalidate_base_font_size())
+    _FONT_SIGNAL_APP = app
+
+
 def _resolve_base_font_size(default: int = 10) -> int:
     """Return the current application font size or a sensible default."""
+    global _BASE_SIZE_CACHE
+    if _BASE_SIZE_CACHE is not None:
+        return _BASE_SIZE_CACHE
     app = QApplication.instance()
     if app is not None:
+        _watch_app_font(app)
         size = app.font().pointSize()
         if size > 0:
+            _BASE_SIZE_CACHE = size
             return size
     return default
 
@@ -21,26 +58,54 @@ def get_base_font_size() -> int:
     return _resolve_base_font_size()
 
 
+_WEIGHT_RESOLVED = QFont.ResolveProperties.WeightResolved.value
+
+
+@lru_cache(maxsize=64)
+def _build_qfont(family: str, point_size: int, weight_int: int | None) -> QFont:
+    """Return a shared QFont for the given family/size/weight (setFont copies it)."""
+    font = QFont(family)
+    font.setPointSize(point_size)
+    if weight_int is not None:
+        font.setWeight(QFont.Weight(weight_int))
+    return font
+
+
 def apply_scaled_font(widget: QWidget, offset: int = 0, weight: QFont.Weight | None = None) -> None:
     """Apply the preferred font family with a size relative to the global preference."""
-    base_size = _resolve_base_font_size()
+    target_size = max(6, _resolve_base_font_size() + offset)
+    weight_int = None if weight is None else int(weight)
     font = widget.font()
-    font.setFamily(MODERN_FONT)
-    font.setPointSize(max(6, base_size + offset))
-    if weight is not None:
-        font.setWeight(weight)
-        widget.setProperty("_font_weight", int(weight))
-    widget.setFont(font)
+    if (
+        widget.property("_font_offset") == offset
+        and (weight_int is None or widget.property("_font_weight") == weight_int)
+        and font.family() == MODERN_FONT
+        and font.pointSize() == target_size
+        and (weight_int is None or font.weight() == weight_int)
+    ):
+        return
+
+    if weight_int is None and font.resolveMask() & _WEIGHT_RESOLVED:
+        # Conservar un peso asignado antes explícitamente al widget
+        widget.setFont(_build_qfont(MODERN_FONT, target_size, int(font.weight())))
+    else:
+        widget.setFont(_build_qfont(MODERN_FONT, target_size, weight_int))
+    if weight_int is not None:
+        widget.setProperty("_font_weight", weight_int)
     widget.setProperty("_font_offset", offset)
 
 
 def refresh_scaled_fonts(root: QWidget) -> None:
     """Re-apply stored offsets for widgets created with apply_scaled_font."""
-    widgets = [root]
-    widgets.extend(root.findChildren(QWidget))
+    # Recorrido completo en cada llamada: solo corre al cambiar la preferencia
+    # de fuente, y así incluye widgets agregados en cualquier nivel del árbol
+    widgets = [root, *root.findChildren(QWidget)]
 
     base_size = _resolve_base_font_size()
+    family = MODERN_FONT
     for widget in widgets:
+        if sip.isdeleted(widget):
+            continue
         offset = widget.property("_font_offset")
         if offset is None:
             continue
@@ -49,11 +114,20 @@ def refresh_scaled_fonts(root: QWidget) -> None:
         except (TypeError, ValueError):
             offset_int = 0
 
+        target_size = max(6, base_size + offset_int)
+        weight_value = widget.property("_font_weight")
         font = widget.font()
-        font.setFamily(MODERN_FONT)
-        font.setPointSize(max(6, base_size + offset_int))
+        # Skip widgets already rendered with the target font to avoid needless relayouts
+        if (
+            font.family() == family
+            and font.pointSize() == target_size
+            and (weight_value is None or font.weight() == int(weight_value))
+        ):
+            continue
+
+        font.setFamily(family)
+        font.setPointSize(target_size)
 
-        weight_value = widget.property("_font_weight")
         if weight_value is not None:
             try:
                 font.setWeight(QFont.Weight(int(weight_value)))
@@ -63,42 +137,54 @@ def refresh_scaled_fonts(root: QWidget) -> None:
         widget.setFont(font)
 
 
-def show_popup_notification(parent, message, duration=3000, color="#3B82F6"):
+def _get_popup_label(parent) -> QLabel:
+    """Return the pooled notification label for *parent*, creating it on first use."""
+    popup = getattr(parent, "_popup_label", None)
+    if popup is not None and not sip.isdeleted(popup):
+        return popup
+
     popup = QLabel(parent)
-    popup.setText(f"  ●  {message}")
-    font_size = max(8, _resolve_base_font_size() + 4)
-    popup.setStyleSheet(
-        f"""
-        QLabel {{
-            background-color: {color};
-            color: white;
-            padding: 12px 22px;
-            border-radius: 10px;
-            font-size: {font_size}px;
-            font-family: '{MODERN_FONT}';
-        }}
-    """
-    )
     popup.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.ToolTip)
     popup.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+    hide_timer = QTimer(popup)
+    hide_timer.setSingleShot(True)
+    hide_timer.timeout.connect(popup.hide)
+    popup._hide_timer = hide_timer
+    popup._style_key = None
+    parent._popup_label = popup
+    return popup
+
+
+def show_popup_notification(parent, message, duration=3000, color="#3B82F6"):
+    popup = _get_popup_label(parent)
+    popup.setText(f"  ●  {message}")
+    font_size = max(8, _resolve_base_font_size() + 4)
+    font = popup.font()
+    if font.family() != MODERN_FONT or font.pixelSize() != font_size:
+        font = QFont(MODERN_FONT)
+        font.setPixelSize(font_size)
+        popup.setFont(font)
+    if popup._style_key != color:
+        popup.setStyleSheet(_TOAST_QSS_TEMPLATE.format(color=color))
+        popup._style_key = color
     popup.adjustSize()
 
     def position_and_show():
         # Guard against parent being deleted before the timer fires
         try:
-            from PyQt6 import sip
-            if sip.isdeleted(parent):
+            if sip.isdeleted(parent) or sip.isdeleted(popup):
                 return
         except Exception:
             pass
         if not parent.isVisible():
-            popup.deleteLater()
+            popup.hide()
             return
         parent_pos = parent.mapToGlobal(QPoint(0, 0))
         x = parent_pos.x() + parent.width() - popup.width() - 30
         y = parent_pos.y() + parent.height() - popup.height() - 30
         popup.move(x, y)
         popup.show()
-        QTimer.singleShot(duration, popup.deleteLater)
+        popup._hide_timer.stop()
+        popup._hide_timer.start(duration)
 
     QTimer.singleShot(0, position_and_show)
@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QEvent, QTimer, Qt
 from core.config import MODERN_FONT
 from .utils import apply_scaled_font
 from .style_tokens import (
@@ -36,7 +36,315 @@ from .style_tokens import (
     SPACE_8,
 )
 
-class ModernButton(QPushButton):
+# Plantillas QSS de botones calculadas una sola vez al importar el módulo.
+# Los tokens de diseño ya van sustituidos; solo quedan los campos por instancia.
+_BUTTON_BASE_QSS = f"""
+    QPushButton {{{{
+        border: 1px solid transparent;
+        border-radius: {RADIUS_MD}px;
+        padding: {{padding_v}}px {{padding_h}}px;
+        font-weight: 500;
+        letter-spacing: 0.3px;
+        text-align: center;
+        min-height: {{min_height}}px;
+        min-width: {{min_width}}px;
+    }}}}
+    QPushButton:disabled {{{{
+        background-color: #F1F5F9;
+        border-color: {COLOR_BORDER};
+        color: #94A3B8;
+    }}}}
+"""
+
+_BUTTON_SECONDARY_QSS = f"""
+    QPushButton {{
+        background-color: {COLOR_SURFACE};
+        color: {COLOR_TEXT_SECONDARY};
+        border-color: {COLOR_BORDER};
+    }}
+    QPushButton:hover {{
+        background-color: #F8FAFC;
+        border-color: {COLOR_BORDER_STRONG};
+    }}
+    QPushButton:pressed {{
+        background-color: #E2E8F0;
+        border-color: {COLOR_BORDER_STRONG};
+    }}
+"""
+
+_BUTTON_VARIANT_QSS = {
+    "primary": f"""
+    QPushButton {{
+        background-color: {COLOR_PRIMARY};
+        color: #FFFFFF;
+    }}
+    QPushButton:hover {{
+        background-color: {COLOR_PRIMARY_HOVER};
+    }}
+    QPushButton:pressed {{
+        background-color: {COLOR_PRIMARY_PRESSED};
+    }}
+""",
+    "secondary": _BUTTON_SECONDARY_QSS,
+    "outline": _BUTTON_SECONDARY_QSS,
+    "success": f"""
+    QPushButton {{
+        background-color: {COLOR_SUCCESS};
+        color: #FFFFFF;
+    }}
+    QPushButton:hover {{
+        background-color: {COLOR_SUCCESS_HOVER};
+    }}
+    QPushButton:pressed {{
+        background-color: {COLOR_SUCCESS_PRESSED};
+    }}
+""",
+    "danger": """
+    QPushButton {
+        background-color: #DC2626;
+        color: #FFFFFF;
+    }
+    QPushButton:hover {
+        background-color: #B91C1C;
+    }
+    QPushButton:pressed {
+        background-color: #991B1B;
+    }
+""",
+    "danger-outline": """
+    QPushButton {
+        background-color: #FFFFFF;
+        color: #B91C1C;
+        border-color: #E5E7EB;
+    }
+    QPushButton:hover {
+        background-color: #FEF2F2;
+        border-color: #F1F5F9;
+    }
+    QPushButton:pressed {
+        background-color: #FDE8E8;
+        border-color: #F1F5F9;
+    }
+""",
+    "warning": """
+    QPushButton {
+        background-color: #F59E0B;
+        color: #FFFFFF;
+    }
+    QPushButton:hover {
+        background-color: #D97706;
+    }
+    QPushButton:pressed {
+        background-color: #B45309;
+    }
+""",
+}
+
+
+# Base + variante unidas en una sola plantilla: un único format por botón
+_BUTTON_TEMPLATES = {
+    button_type: _BUTTON_BASE_QSS + variant.replace("{", "{{").replace("}", "}}")
+    for button_type, variant in _BUTTON_VARIANT_QSS.items()
+}
+
+# Estilos ya compuestos por (widget, parámetros); los botones idénticos comparten el mismo string
+_STYLE_CACHE: dict[tuple, str] = {}
+
+# Sin font-size: el tamaño lo da la fuente del widget (apply_scaled_font)
+_LINE_EDIT_QSS = f"""
+QLineEdit {{
+    background: {COLOR_SURFACE};
+    border: 1px solid {COLOR_BORDER};
+    border-radius: {RADIUS_MD}px;
+    padding: {SPACE_8}px {SPACE_12}px;
+    color: {COLOR_TEXT_PRIMARY};
+    selection-background-color: #DBEAFE;
+}}
+QLineEdit::placeholder {{
+    color: #9CA3AF;
+}}
+QLineEdit:focus {{
+    border-color: {COLOR_PRIMARY};
+    background: {COLOR_SURFACE};
+    outline: none;
+
+}}
+QLineEdit:hover {{
+    border-color: {COLOR_BORDER_STRONG};
+}}
+QLineEdit:disabled {{
+    background-color: #F9FAFB;
+    color: #6B7280;
+    border-color: #E5E7EB;
+}}
+"""
+
+_COMBO_BOX_QSS = f"""
+QComboBox {{
+    background: {COLOR_SURFACE};
+    border: 1px solid {COLOR_BORDER};
+    border-radius: {RADIUS_MD}px;
+    padding: {SPACE_8}px {SPACE_12}px;
+    color: {COLOR_TEXT_PRIMARY};
+    min-width: 140px;
+    selection-background-color: #DBEAFE;
+}}
+QComboBox:focus {{
+    border-color: {COLOR_PRIMARY};
+    outline: none;
+}}
+QComboBox:hover {{
+    border-color: {COLOR_BORDER_STRONG};
+}}
+QComboBox::drop-down {{
+    border: none;
+    width: 30px;
+    background: transparent;
+}}
+QComboBox::down-arrow {{
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 6px solid #6B7280;
+    margin-right: 8px;
+}}
+QComboBox:on {{
+    border-color: #3B82F6;
+}}
+QComboBox::down-arrow:on {{
+    border-top-color: #3B82F6;
+}}
+QComboBox QAbstractItemView {{
+    border: 1px solid {COLOR_BORDER};
+    border-radius: {RADIUS_MD}px;
+    background: {COLOR_SURFACE};
+    selection-background-color: #EFF6FF;
+    selection-color: #1F2937;
+    padding: 4px;
+    outline: none;
+}}
+QComboBox QAbstractItemView::item {{
+    padding: 8px 12px;
+    border-radius: {SPACE_8}px;
+    margin: 1px;
+}}
+QComboBox QAbstractItemView::item:selected {{
+    background-color: #EFF6FF;
+    color: #1F2937;
+}}
+QComboBox QAbstractItemView::item:hover {{
+    background-color: #F3F4F6;
+}}
+"""
+
+# Plantillas QSS de badges por tipo de status
+_BADGE_BASE_QSS = """
+    QLabel {
+        padding: 4px 10px;
+        border-radius: 10px;
+        border: 1px solid transparent;
+        font-weight: 500;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }
+"""
+_BADGE_VARIANT_QSS = {
+    "success": f"""
+    QLabel {{
+        background-color: {COLOR_SUCCESS_SOFT_BG};
+        border-color: {COLOR_SUCCESS_SOFT_BORDER};
+        color: {COLOR_SUCCESS_SOFT_TEXT};
+    }}
+""",
+    "warning": """
+    QLabel {
+        background-color: #FFFBEB;
+        border-color: #FDE68A;
+        color: #92400E;
+    }
+""",
+    "error": """
+    QLabel {
+        background-color: #FEF2F2;
+        border-color: #FECACA;
+        color: #B91C1C;
+    }
+""",
+    "info": """
+    QLabel {
+        background-color: #EFF6FF;
+        border-color: #BFDBFE;
+        color: #1D4ED8;
+    }
+""",
+    "default": """
+    QLabel {
+        background-color: #F1F5F9;
+        border-color: #CBD5E1;
+        color: #475569;
+    }
+""",
+}
+
+_FONT_CHANGE = QEvent.Type.FontChange
+
+
+def _font_key(font: QFont) -> Tuple[str, int, int]:
+    return font.family(), font.pointSize(), int(font.weight())
+
+
+class _FontRestyleMixin:
+    """Agrupa los FontChange de un mismo tick en un único restyle diferido.
+
+    Las subclases solo definen apply_professional_style (el paso de QSS) y,
+    si lo necesitan, _font_offset/_font_weight para el reescalado.
+    """
+
+    _font_offset = 0
+    _font_weight = None
+    _font_change_pending = False
+    _handling_font_change = False
+    _last_font_key = None
+    _last_style_key = None
+
+    def changeEvent(self, event):  # type: ignore[override]
+        if (
+            event.type() == _FONT_CHANGE
+            and not self._handling_font_change
+            and not self._font_change_pending
+        ):
+            self._font_change_pending = True
+            QTimer.singleShot(0, self._do_font_restyle)
+        super().changeEvent(event)
+
+    def _do_font_restyle(self):
+        self._font_change_pending = False
+        # setFont entrega el FontChange de forma síncrona: el flag lo descarta y
+        # con las actualizaciones pausadas fuente y estilo se pintan una sola vez
+        self._handling_font_change = True
+        self.setUpdatesEnabled(False)
+        try:
+            self._rescale_font()
+            key = _font_key(self.font())
+            if key != self._last_font_key:
+                self._last_font_key = key
+                self.apply_professional_style()
+        finally:
+            self.setUpdatesEnabled(True)
+            self._handling_font_change = False
+
+    def _init_font_style(self, initial_offset: int | None = None):
+        """Fuente y estilo iniciales; recuerda la clave de fuente ya estilizada."""
+        offset = self._font_offset if initial_offset is None else initial_offset
+        apply_scaled_font(self, offset=offset, weight=self._font_weight)
+        self.apply_professional_style()
+        self._last_font_key = _font_key(self.font())
+
+    def _rescale_font(self):
+        apply_scaled_font(self, offset=self._font_offset, weight=self._font_weight)
+
+
+class ModernButton(_FontRestyleMixin, QPushButton):
     def __init__(
         self,
         text,
@@ -62,284 +370,75 @@ class ModernButton(QPushButton):
         self._font_weight = (
             QFont.Weight.Medium if font_weight is None else font_weight
         )
-        apply_scaled_font(self, offset=self._font_offset, weight=self._font_weight)
-        self.apply_professional_style()
+        self._init_font_style()
 
     def apply_professional_style(self):
         """Aplicar estilos profesionales según el tipo de botón"""
-        base_style = f"""
-            QPushButton {{
-                border: 1px solid transparent;
-                border-radius: {RADIUS_MD}px;
-                padding: {self._padding_vertical}px {self._padding_horizontal}px;
-                font-weight: 500;
-                letter-spacing: 0.3px;
-                text-align: center;
-                min-height: {self._min_height}px;
-                min-width: {self._min_width}px;
-            }}
-            QPushButton:disabled {{
-                background-color: #F1F5F9;
-                border-color: {COLOR_BORDER};
-                color: #94A3B8;
-            }}
-        """
-
-        if self.button_type == "primary":
-            style = base_style + f"""
-                QPushButton {{
-                    background-color: {COLOR_PRIMARY};
-                    color: #FFFFFF;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLOR_PRIMARY_HOVER};
-                }}
-                QPushButton:pressed {{
-                    background-color: {COLOR_PRIMARY_PRESSED};
-                }}
-            """
-        elif self.button_type in ("secondary", "outline"):
-            style = base_style + f"""
-                QPushButton {{
-                    background-color: {COLOR_SURFACE};
-                    color: {COLOR_TEXT_SECONDARY};
-                    border-color: {COLOR_BORDER};
-                }}
-                QPushButton:hover {{
-                    background-color: #F8FAFC;
-                    border-color: {COLOR_BORDER_STRONG};
-                }}
-                QPushButton:pressed {{
-                    background-color: #E2E8F0;
-                    border-color: {COLOR_BORDER_STRONG};
-                }}
-            """
-        elif self.button_type == "success":
-            style = base_style + f"""
-                QPushButton {{
-                    background-color: {COLOR_SUCCESS};
-                    color: #FFFFFF;
-                }}
-                QPushButton:hover {{
-                    background-color: {COLOR_SUCCESS_HOVER};
-                }}
-                QPushButton:pressed {{
-                    background-color: {COLOR_SUCCESS_PRESSED};
-                }}
-            """
-        elif self.button_type == "danger":
-            style = base_style + """
-                QPushButton {
-                    background-color: #DC2626;
-                    color: #FFFFFF;
-                }
-                QPushButton:hover {
-                    background-color: #B91C1C;
-                }
-                QPushButton:pressed {
-                    background-color: #991B1B;
-                }
-            """
-        elif self.button_type == "danger-outline":
-            style = base_style + """
-                QPushButton {
-                    background-color: #FFFFFF;
-                    color: #B91C1C;
-                    border-color: #E5E7EB;
-                }
-                QPushButton:hover {
-                    background-color: #FEF2F2;
-                    border-color: #F1F5F9;
-                }
-                QPushButton:pressed {
-                    background-color: #FDE8E8;
-                    border-color: #F1F5F9;
-                }
-            """
-        elif self.button_type == "warning":
-            style = base_style + """
-                QPushButton {
-                    background-color: #F59E0B;
-                    color: #FFFFFF;
-                }
-                QPushButton:hover {
-                    background-color: #D97706;
-                }
-                QPushButton:pressed {
-                    background-color: #B45309;
-                }
-            """
-        else:
-            style = base_style
-
+        key = (
+            "button",
+            self.button_type,
+            self._padding_vertical,
+            self._padding_horizontal,
+            self._min_height,
+            self._min_width,
+        )
+        if key == self._last_style_key:
+            return
+        style = _STYLE_CACHE.get(key)
+        if style is None:
+            template = _BUTTON_TEMPLATES.get(self.button_type, _BUTTON_BASE_QSS)
+            style = template.format(
+                padding_v=self._padding_vertical,
+                padding_h=self._padding_horizontal,
+                min_height=self._min_height,
+                min_width=self._min_width,
+            )
+            _STYLE_CACHE[key] = style
         self.setStyleSheet(style)
+        self._last_style_key = key
 
-    def changeEvent(self, event):  # type: ignore[override]
-        from PyQt6.QtCore import QEvent
-
-        if event.type() == QEvent.Type.FontChange:
-            if getattr(self, "_handling_font_change", False):
-                super().changeEvent(event)
-                return
-            self._handling_font_change = True
-            try:
-                apply_scaled_font(
-                    self,
-                    offset=getattr(self, "_font_offset", 0),
-                    weight=getattr(self, "_font_weight", QFont.Weight.Medium),
-                )
-                self.apply_professional_style()
-            finally:
-                self._handling_font_change = False
-        super().changeEvent(event)
 
-class ModernLineEdit(QLineEdit):
+class ModernLineEdit(_FontRestyleMixin, QLineEdit):
     def __init__(self, placeholder=""):
         super().__init__()
         self.setPlaceholderText(placeholder)
         self.setMinimumHeight(CONTROL_HEIGHT)
-        apply_scaled_font(self, offset=3)
-        self.apply_professional_style()
+        # El reescalado posterior usa el offset por defecto (0), como antes
+        self._init_font_style(initial_offset=3)
 
     def apply_professional_style(self):
         """Aplicar estilo profesional al input"""
-        font_size = max(13, self.font().pointSize() + 2)
-        placeholder_font_size = font_size
-        self.setStyleSheet(
-            f"""
-            QLineEdit {{
-                background: {COLOR_SURFACE};
-                border: 1px solid {COLOR_BORDER};
-                border-radius: {RADIUS_MD}px;
-                padding: {SPACE_8}px {SPACE_12}px;
-                font-size: {font_size}px;
-                color: {COLOR_TEXT_PRIMARY};
-                selection-background-color: #DBEAFE;
-            }}
-            QLineEdit::placeholder {{
-                color: #9CA3AF;
-                font-size: {placeholder_font_size}px;
-            }}
-            QLineEdit:focus {{
-                border-color: {COLOR_PRIMARY};
-                background: {COLOR_SURFACE};
-                outline: none;
+        if self._last_style_key is _LINE_EDIT_QSS:
+            return
+        self.setStyleSheet(_LINE_EDIT_QSS)
+        self._last_style_key = _LINE_EDIT_QSS
 
-            }}
-            QLineEdit:hover {{
-                border-color: {COLOR_BORDER_STRONG};
-            }}
-            QLineEdit:disabled {{
-                background-color: #F9FAFB;
-                color: #6B7280;
-                border-color: #E5E7EB;
-            }}
-        """
-        )
 
-    def changeEvent(self, event):  # type: ignore[override]
-        from PyQt6.QtCore import QEvent
-
-        if event.type() == QEvent.Type.FontChange:
-            if getattr(self, "_handling_font_change", False):
-                super().changeEvent(event)
-                return
-            self._handling_font_change = True
-            try:
-                apply_scaled_font(self)
-                self.apply_professional_style()
-            finally:
-                self._handling_font_change = False
-        super().changeEvent(event)
-
-class ModernComboBox(QComboBox):
+class ModernComboBox(_FontRestyleMixin, QComboBox):
     def __init__(self):
         super().__init__()
         self.setMinimumHeight(CONTROL_HEIGHT)
-        apply_scaled_font(self)
-        self.apply_professional_style()
+        self._init_font_style()
 
     def apply_professional_style(self):
         """Aplicar estilo profesional al combobox"""
-        font_size = max(12, self.font().pointSize() + 2)
-        self.setStyleSheet(
-            f"""
-            QComboBox {{
+        if self._last_style_key is _COMBO_BOX_QSS:
+            return
+        self.setStyleSheet(_COMBO_BOX_QSS)
+        self._last_style_key = _COMBO_BOX_QSS
+
+
+class ProfessionalCard(QFrame):
+    """Widget de tarjeta profesional para agrupar contenido"""
+    _CARD_QSS = f"""
+            QFrame {{
                 background: {COLOR_SURFACE};
                 border: 1px solid {COLOR_BORDER};
                 border-radius: {RADIUS_MD}px;
-                padding: {SPACE_8}px {SPACE_12}px;
-                font-size: {font_size}px;
-                color: {COLOR_TEXT_PRIMARY};
-                min-width: 140px;
-                selection-background-color: #DBEAFE;
-            }}
-            QComboBox:focus {{
-                border-color: {COLOR_PRIMARY};
-                outline: none;
-            }}
-            QComboBox:hover {{
-                border-color: {COLOR_BORDER_STRONG};
-            }}
-            QComboBox::drop-down {{
-                border: none;
-                width: 30px;
-                background: transparent;
-            }}
-            QComboBox::down-arrow {{
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 6px solid #6B7280;
-                margin-right: 8px;
-            }}
-            QComboBox:on {{
-                border-color: #3B82F6;
-            }}
-            QComboBox::down-arrow:on {{
-                border-top-color: #3B82F6;
-            }}
-            QComboBox QAbstractItemView {{
-                border: 1px solid {COLOR_BORDER};
-                border-radius: {RADIUS_MD}px;
-                background: {COLOR_SURFACE};
-                selection-background-color: #EFF6FF;
-                selection-color: #1F2937;
-                padding: 4px;
-                outline: none;
-            }}
-            QComboBox QAbstractItemView::item {{
-                padding: 8px 12px;
-                border-radius: {SPACE_8}px;
-                margin: 1px;
-            }}
-            QComboBox QAbstractItemView::item:selected {{
-                background-color: #EFF6FF;
-                color: #1F2937;
-            }}
-            QComboBox QAbstractItemView::item:hover {{
-                background-color: #F3F4F6;
             }}
         """
-        )
-
-    def changeEvent(self, event):  # type: ignore[override]
-        from PyQt6.QtCore import QEvent
-
-        if event.type() == QEvent.Type.FontChange:
-            if getattr(self, "_handling_font_change", False):
-                super().changeEvent(event)
-                return
-            self._handling_font_change = True
-            try:
-                apply_scaled_font(self)
-                self.apply_professional_style()
-            finally:
-                self._handling_font_change = False
-        super().changeEvent(event)
+    _TITLE_QSS = f"color: {COLOR_TEXT_PRIMARY}; margin-bottom: {SPACE_8}px;"
 
-class ProfessionalCard(QFrame):
-    """Widget de tarjeta profesional para agrupar contenido"""
     def __init__(self, title="", parent=None):
         super().__init__(parent)
         self.setFrameStyle(QFrame.Shape.NoFrame)
@@ -354,18 +453,12 @@ class ProfessionalCard(QFrame):
         if title:
             self.title_label = QLabel(title)
             apply_scaled_font(self.title_label, offset=4, weight=QFont.Weight.DemiBold)
-            self.title_label.setStyleSheet(f"color: {COLOR_TEXT_PRIMARY}; margin-bottom: {SPACE_8}px;")
+            self.title_label.setStyleSheet(self._TITLE_QSS)
             self.card_layout.addWidget(self.title_label)
     
     def apply_card_style(self):
         """Aplicar estilo de tarjeta profesional"""
-        self.setStyleSheet(f"""
-            QFrame {{
-                background: {COLOR_SURFACE};
-                border: 1px solid {COLOR_BORDER};
-                border-radius: {RADIUS_MD}px;
-            }}
-        """)
+        self.setStyleSheet(self._CARD_QSS)
     
     def add_widget(self, widget):
         """Agregar widget al contenido de la tarjeta"""
@@ -377,6 +470,8 @@ class ProfessionalCard(QFrame):
 
 class StatusBadge(QLabel):
     """Badge profesional para mostrar estados"""
+    _STYLES = {key: _BADGE_BASE_QSS + variant for key, variant in _BADGE_VARIANT_QSS.items()}
+
     def __init__(self, text="", status_type="default"):
         super().__init__(text)
         self.status_type = status_type
@@ -386,68 +481,24 @@ class StatusBadge(QLabel):
     
     def apply_badge_style(self):
         """Aplicar estilo según el tipo de status"""
-        base_style = """
-            QLabel {
-                padding: 4px 10px;
-                border-radius: 10px;
-                border: 1px solid transparent;
-                font-weight: 500;
-                text-transform: uppercase;
-                letter-spacing: 0.5px;
-            }
-        """
-        
-        if self.status_type == "success":
-            style = base_style + f"""
-                QLabel {
-                    background-color: {COLOR_SUCCESS_SOFT_BG};
-                    border-color: {COLOR_SUCCESS_SOFT_BORDER};
-                    color: {COLOR_SUCCESS_SOFT_TEXT};
-                }
-            """
-        elif self.status_type == "warning":
-            style = base_style + """
-                QLabel {
-                    background-color: #FFFBEB;
-                    border-color: #FDE68A;
-                    color: #92400E;
-                }
-            """
-        elif self.status_type == "error":
-            style = base_style + """
-                QLabel {
-                    background-color: #FEF2F2;
-                    border-color: #FECACA;
-                    color: #B91C1C;
-                }
-            """
-        elif self.status_type == "info":
-            style = base_style + """
-                QLabel {
-                    background-color: #EFF6FF;
-                    border-color: #BFDBFE;
-                    color: #1D4ED8;
-                }
-            """
-        else:  # default
-            style = base_style + """
-                QLabel {
-                    background-color: #F1F5F9;
-                    border-color: #CBD5E1;
-                    color: #475569;
-                }
-            """
-        
-        self.setStyleSheet(style)
+        self.setStyleSheet(self._STYLES.get(self.status_type, self._STYLES["default"]))
     
     def update_status(self, text, status_type):
         """Actualizar el texto y tipo del badge"""
         self.setText(text)
-        self.status_type = status_type
-        self.apply_badge_style()
+        if status_type != self.status_type:
+            self.status_type = status_type
+            self.apply_badge_style()
 
 class ProfessionalSeparator(QFrame):
     """Separador profesional"""
+    _SEPARATOR_QSS = """
+            QFrame {
+                background-color: #E5E7EB;
+                border: none;
+            }
+        """
+
     def __init__(self, orientation="horizontal"):
         super().__init__()
         if orientation == "horizontal":
@@ -457,15 +508,18 @@ class ProfessionalSeparator(QFrame):
             self.setFrameShape(QFrame.Shape.VLine)
             self.setFixedWidth(1)
         
-        self.setStyleSheet("""
-            QFrame {
-                background-color: #E5E7EB;
-                border: none;
-            }
-        """)
+        self.setStyleSheet(self._SEPARATOR_QSS)
 
 class ProfessionalSpinner(QLabel):
     """Indicador de carga profesional"""
+    _SPINNER_QSS = """
+            QLabel {{
+                color: #3B82F6;
+                font-size: {font_size}pt;
+                font-weight: bold;
+            }}
+        """
+
     def __init__(self, size=20):
         super().__init__()
         self.size = size
@@ -475,15 +529,12 @@ class ProfessionalSpinner(QLabel):
         # Crear animación simple con texto
         self.setText("●")
         font_size = max(6, self.font().pointSize() - 2)
-        self.setStyleSheet(
-            f"""
-            QLabel {{
-                color: #3B82F6;
-                font-size: {font_size}px;
-                font-weight: bold;
-            }}
-        """
-        )
+        key = ("spinner", font_size)
+        style = _STYLE_CACHE.get(key)
+        if style is None:
+            style = self._SPINNER_QSS.format(font_size=font_size)
+            _STYLE_CACHE[key] = style
+        self.setStyleSheet(style)
     
     def start_animation(self):
         """Iniciar animación (simplificada)"""
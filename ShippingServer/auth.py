@@ -1,7 +1,11 @@
 ﻿# auth.py - Sistema de autenticación JWT
-from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, Optional, Tuple
+import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -10,16 +14,44 @@ from models import User
 from database import get_db
 
 # Configuración
-SECRET_KEY = "tu_secret_key_super_segura_aqui_cambiar_en_produccion"
+SECRET_KEY = os.getenv("SECRET_KEY", "tu_secret_key_super_segura_aqui_cambiar_en_produccion")
 ALGORITHM = "HS256"
+_SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+_ALGORITHMS = (ALGORITHM,)
 ACCESS_TOKEN_EXPIRE_MINUTES = 8 * 60  # 8 horas
 
 # Setup password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 10 rondas de bcrypt: ~4x más rápido que el default (12) en cada login;
+# los hashes existentes con 12 rondas siguen verificando normalmente
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10)
 security = HTTPBearer()
 
+# Verificaciones bcrypt exitosas recientes: (hash, sha256(plain)) -> expiración.
+# Solo se guardan positivos; un cambio de contraseña cambia el hash y la clave.
+VERIFY_CACHE_TTL_SECONDS = 60
+VERIFY_CACHE_MAX_ENTRIES = 1024
+_verify_cache: Dict[Tuple[str, bytes], float] = {}
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    key = (hashed_password, hashlib.sha256(plain_password.encode("utf-8")).digest())
+    now = time.monotonic()
+    expires_at = _verify_cache.get(key)
+    if expires_at is not None:
+        if expires_at > now:
+            return True
+        _verify_cache.pop(key, None)
+
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+
+    if len(_verify_cache) >= VERIFY_CACHE_MAX_ENTRIES:
+        # Descartar primero los expirados; si no alcanza, el más antiguo
+        for stale in [k for k, exp in _verify_cache.items() if exp <= now]:
+            del _verify_cache[stale]
+        if len(_verify_cache) >= VERIFY_CACHE_MAX_ENTRIES:
+            del _verify_cache[next(iter(_verify_cache))]
+    _verify_cache[key] = now + VERIFY_CACHE_TTL_SECONDS
+    return True
 
 def get_password_hash(password):
     return pwd_context.hash(password)
@@ -35,15 +67,36 @@ def authenticate_user(db: Session, username: str, password: str):
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        lifetime = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+    # exp como timestamp Unix entero (lo que JWT serializa de todas formas)
+    to_encode["exp"] = int(time.time()) + lifetime
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+@dataclass(frozen=True)
+class CurrentUser:
+    """Datos del usuario autenticado, desacoplados de la sesión de la BD."""
+    id: int
+    username: str
+    email: str
+    role: str
+    is_active: str
+
+# username -> (expiración, usuario); evita consultar la BD en cada request
+USER_CACHE_TTL_SECONDS = 5
+_user_cache: Dict[str, Tuple[float, CurrentUser]] = {}
+
+def invalidate_user_cache(username: Optional[str] = None):
+    """Olvidar un usuario cacheado (o todos) tras modificarlo."""
+    if username is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(username, None)
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> CurrentUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -52,17 +105,36 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(
+            token,
+            _SECRET_KEY_BYTES,
+            algorithms=_ALGORITHMS,
+            options={"require": ["exp", "sub"]},
+        )
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise credentials_exception
     
+    now = time.monotonic()
+    cached = _user_cache.get(username)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
     user = db.query(User).filter(User.username == username).first()
     if user is None or user.is_active != "active":
+        _user_cache.pop(username, None)
         raise credentials_exception
-    return user
+    current_user = CurrentUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        role=user.role,
+        is_active=user.is_active,
+    )
+    _user_cache[username] = (now + USER_CACHE_TTL_SECONDS, current_user)
+    return current_user
 
 # Schemas para autenticación
 from pydantic import BaseModel
@@ -85,7 +157,18 @@ class UserCreate(BaseModel):
     password: str
     role: str = "read"
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
+def require_roles(*roles: str) -> Callable[..., CurrentUser]:
+    """Dependency factory que exige uno de los roles indicados."""
+    allowed = frozenset(roles)
+
+    def dependency(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if current_user.role not in allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
+        return current_user
+
+    return dependency
+
+def get_current_admin_user(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
     return current_user
@@ -1,31 +1,40 @@
 ﻿# main.py - Servidor principal FastAPI
-from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import timedelta, datetime, date
-import json
 import asyncio
+import anyio
+import hashlib
+import orjson
 import logging
+import os
+import threading
 import time
+from sqlalchemy import insert, tuple_
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm.exc import StaleDataError
 
 # Imports locales
 from database import get_db, create_tables, create_admin_user
 from models import User, Shipment, AuditLog, ShippingLog, AppConnectionSettings, Sill, SillLog, SillDieDatabase
-from auth import authenticate_user, create_access_token, get_current_user, get_current_admin_user, Token, UserLogin, UserCreate
-from pydantic import BaseModel
+from auth import authenticate_user, create_access_token, CurrentUser, get_current_user, get_current_admin_user, require_roles, get_password_hash, invalidate_user_cache, Token, UserLogin, UserCreate
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from fedex_service import FedExService
 
 # Crear app FastAPI
-app = FastAPI(title="Shipping Schedule API", version="1.0.0")
+app = FastAPI(title="Shipping Schedule API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configuración básica de logging para depuración
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 fedex_service = FedExService()
 
+# Una sola instancia para que FastAPI la resuelva una vez por request
+require_write = require_roles("write", "admin")
+
 # CORS para permitir conexiones desde clientes
 app.add_middleware(
     CORSMiddleware,
@@ -36,28 +45,121 @@ app.add_middleware(
 )
 
 # Manager para WebSocket connections
+BROADCAST_BATCH_SIZE = 50
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections.copy():
-            try:
-                await connection.send_text(message)
-            except:
-                # Conexión cerrada, remover
-                self.disconnect(connection)
+    @staticmethod
+    async def _send(connection: WebSocket, message: str):
+        try:
+            # Frames de texto: los clientes existentes esperan str en on_message
+            await connection.send_text(message)
+        except Exception:
+            return connection
+        return None
+
+    async def broadcast(self, message: bytes):
+        # Payload ya serializado (y decodificado) una sola vez; envíos
+        # concurrentes para que un cliente lento no retrase a los demás
+        text = message.decode("utf-8")
+        connections = list(self.active_connections)
+        for start in range(0, len(connections), BROADCAST_BATCH_SIZE):
+            if start:
+                # Ceder el loop entre lotes para no acumular corrutinas
+                await asyncio.sleep(0)
+            batch = connections[start:start + BROADCAST_BATCH_SIZE]
+            failed = await asyncio.gather(*(self._send(c, text) for c in batch))
+            for connection in failed:
+                if connection is not None:
+                    # Conexión cerrada, remover
+                    self.disconnect(connection)
 
 manager = ConnectionManager()
 
+# Fan-out entre workers: con REDIS_URL cada evento se publica en Redis y cada
+# proceso lo reenvía a sus propios WebSockets; sin Redis se difunde localmente
+REDIS_URL = os.getenv("REDIS_URL")
+BROADCAST_CHANNEL = "shipments"
+WS_RELAY_MAX_BACKOFF_SECONDS = 30
+app.state.redis = None
+app.state.ws_relay = None
+# True solo mientras el relay está suscrito y recibe las invalidaciones de los demás workers
+app.state.ws_relay_subscribed = False
+
+# Referencias a los broadcasts en curso para que el GC no los cancele
+_broadcast_tasks: set[asyncio.Task] = set()
+
+def _on_broadcast_done(task: asyncio.Task):
+    _broadcast_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Failed to broadcast event: {task.exception()}")
+
+def _broadcast_locally(message: bytes):
+    # El fan-out corre en segundo plano: la respuesta HTTP no lo espera
+    task = asyncio.create_task(manager.broadcast(message))
+    _broadcast_tasks.add(task)
+    task.add_done_callback(_on_broadcast_done)
+
+async def publish_event(message: bytes):
+    redis_client = app.state.redis
+    if redis_client is None:
+        _broadcast_locally(message)
+        return
+    try:
+        await redis_client.publish(BROADCAST_CHANNEL, message)
+    except Exception as e:
+        # Sin Redis al menos los clientes de este worker reciben el evento
+        logger.warning(f"Redis publish failed, broadcasting locally: {e}")
+        _broadcast_locally(message)
+
+def publish_event_from_thread(message: bytes):
+    """Publicar desde un handler sync (threadpool) en el event loop principal."""
+    anyio.from_thread.run(publish_event, message)
+
+async def _ws_relay(redis_client):
+    from redis.exceptions import RedisError
+
+    backoff = 1
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(BROADCAST_CHANNEL)
+                logger.info("Subscribed to Redis channel %s", BROADCAST_CHANNEL)
+                backoff = 1
+                # Pudieron perderse eventos mientras no había suscripción
+                invalidate_shipments_cache()
+                app.state.ws_relay_subscribed = True
+                async for event in pubsub.listen():
+                    if event.get("type") != "message":
+                        continue
+                    data = event["data"]
+                    if isinstance(data, str):
+                        data = data.encode("utf-8")
+                    # El cambio pudo hacerse en otro worker: descartar el cache local
+                    invalidate_shipments_cache()
+                    await manager.broadcast(data)
+        except asyncio.CancelledError:
+            app.state.ws_relay_subscribed = False
+            raise
+        except (RedisError, OSError) as e:
+            logger.warning(f"Redis relay disconnected ({e}); retrying in {backoff}s")
+        except Exception:
+            logger.exception(f"Unexpected error in Redis relay; retrying in {backoff}s")
+        # Sin suscripción este worker no se entera de cambios ajenos: sin cache
+        app.state.ws_relay_subscribed = False
+        invalidate_shipments_cache()
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, WS_RELAY_MAX_BACKOFF_SECONDS)
+
 # Schemas para API
 class ShipmentCreate(BaseModel):
     job_number: str
@@ -110,8 +212,7 @@ class ShipmentResponse(BaseModel):
     version: int
     last_modified_by: int | None = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # ==== Esquemas de Usuario ====
 
@@ -129,8 +230,7 @@ class UserResponse(BaseModel):
     role: str
     is_active: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FedExConnectionSettingsUpdate(BaseModel):
@@ -156,8 +256,7 @@ class ShippingLogResponse(BaseModel):
     new_value: str
     changed_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SillCreate(BaseModel):
@@ -215,8 +314,7 @@ class SillResponse(BaseModel):
     week_to_print: str
     created_by: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SillLogResponse(BaseModel):
@@ -230,8 +328,7 @@ class SillLogResponse(BaseModel):
     new_value: str
     changed_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SillDieCreate(BaseModel):
@@ -264,8 +361,7 @@ class SillDieResponse(BaseModel):
     notes: str
     vendor_drawing: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 def _safe_text(value) -> str:
@@ -304,17 +400,20 @@ def _append_shipping_logs(
     user_id: int,
     changes: dict[str, dict[str, str]],
 ):
-    for field_name, diff in changes.items():
-        db.add(
-            ShippingLog(
-                shipment_id=shipment_id,
-                changed_by=user_id,
-                action=action,
-                field_name=field_name,
-                old_value=_safe_text(diff.get("old")),
-                new_value=_safe_text(diff.get("new")),
-            )
-        )
+    rows = [
+        {
+            "shipment_id": shipment_id,
+            "changed_by": user_id,
+            "action": action,
+            "field_name": field_name,
+            "old_value": _safe_text(diff.get("old")),
+            "new_value": _safe_text(diff.get("new")),
+        }
+        for field_name, diff in changes.items()
+    ]
+    if rows:
+        # INSERT de Core en lote: misma transacción, sin unit-of-work por fila
+        db.execute(insert(ShippingLog), rows)
 
 
 def _append_sills_logs(
@@ -325,22 +424,25 @@ def _append_sills_logs(
     user_id: int,
     changes: dict[str, dict[str, str]],
 ):
-    for field_name, diff in changes.items():
-        db.add(
-            SillLog(
-                sill_id=sill_id,
-                changed_by=user_id,
-                action=action,
-                field_name=field_name,
-                old_value=_safe_text(diff.get("old")),
-                new_value=_safe_text(diff.get("new")),
-            )
-        )
+    rows = [
+        {
+            "sill_id": sill_id,
+            "changed_by": user_id,
+            "action": action,
+            "field_name": field_name,
+            "old_value": _safe_text(diff.get("old")),
+            "new_value": _safe_text(diff.get("new")),
+        }
+        for field_name, diff in changes.items()
+    ]
+    if rows:
+        # INSERT de Core en lote: misma transacción, sin unit-of-work por fila
+        db.execute(insert(SillLog), rows)
 
 # ============ ENDPOINTS DE AUTENTICACIÓN ============
 
 @app.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+def login(user_data: UserLogin, db: Session = Depends(get_db)):
     user = authenticate_user(db, user_data.username, user_data.password)
     if not user:
         raise HTTPException(
@@ -364,74 +466,77 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         }
     }
 
-@app.post("/register")
-async def register(
-    user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
-):
-    # Verificar si usuario ya existe
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
+def _create_user_account(db: Session, user_data: UserCreate) -> User:
+    """Alta de usuario compartida por /register y /users."""
+    # Chequeo barato antes de pagar el hash bcrypt; el índice único cubre la carrera
+    username_taken = db.query(
+        db.query(User.id).filter(User.username == user_data.username).exists()
+    ).scalar()
+    if username_taken:
         raise HTTPException(status_code=400, detail="Username already registered")
-    
-    # Crear nuevo usuario
-    from auth import get_password_hash
-    hashed_password = get_password_hash(user_data.password)
+
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hashed_password,
+        hashed_password=get_password_hash(user_data.password),
         role=user_data.role
     )
-    
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        error_msg = str(e.orig).lower()
+        if "username" in error_msg:
+            raise HTTPException(status_code=400, detail="Username already registered")
+        if "email" in error_msg:
+            raise HTTPException(status_code=400, detail="Email already registered")
+        logger.error(f"Integrity error creating user {user_data.username}: {e}")
+        raise HTTPException(status_code=400, detail="Data integrity error")
+    return new_user
 
+@app.post("/register")
+def register(
+    user_data: UserCreate,
+    db: Session = Depends(get_db),
+    current_admin: CurrentUser = Depends(get_current_admin_user)
+):
+    new_user = _create_user_account(db, user_data)
     return {"message": "User created successfully", "user_id": new_user.id}
 
 @app.post("/users")
-async def create_user(
+def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user)
+    current_admin: CurrentUser = Depends(get_current_admin_user)
 ):
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Username already registered")
-
-    from auth import get_password_hash
-    hashed_password = get_password_hash(user_data.password)
-    new_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        hashed_password=hashed_password,
-        role=user_data.role
-    )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    new_user = _create_user_account(db, user_data)
     return {"message": "User created successfully", "user_id": new_user.id}
 
+_USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+
 @app.get("/users", response_model=List[UserResponse])
-async def list_users(
+def list_users(
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
 ):
     users = db.query(User).all()
-    return users
+    body = _USER_LIST_ADAPTER.dump_json(
+        _USER_LIST_ADAPTER.validate_python(users, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
 
 @app.put("/users/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
 ):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    previous_username = user.username
     if user_data.username is not None:
         user.username = user_data.username
     if user_data.email is not None:
@@ -441,23 +546,25 @@ async def update_user(
     if user_data.is_active is not None:
         user.is_active = user_data.is_active
     if user_data.password:
-        from auth import get_password_hash
         user.hashed_password = get_password_hash(user_data.password)
     db.commit()
     db.refresh(user)
+    invalidate_user_cache(previous_username)
     return user
 
 @app.delete("/users/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
 ):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    username = user.username
     db.delete(user)
     db.commit()
+    invalidate_user_cache(username)
     return {"message": "User deleted"}
 
 
@@ -483,9 +590,9 @@ def _normalize_fedex_base_url(base_url: str | None) -> str:
 
 
 @app.get("/settings/connections")
-async def get_connection_settings(
+def get_connection_settings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     fedex = _get_or_create_fedex_settings(db)
     return {
@@ -500,10 +607,10 @@ async def get_connection_settings(
 
 
 @app.put("/settings/connections/fedex")
-async def update_fedex_connection_settings(
+def update_fedex_connection_settings(
     payload: FedExConnectionSettingsUpdate,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
 ):
     api_key = (payload.apiKey or "").strip()
     secret_key = (payload.secretKey or "").strip()
@@ -537,9 +644,9 @@ async def update_fedex_connection_settings(
 
 
 @app.post("/settings/connections/fedex/test")
-async def test_fedex_connection_settings(
+def test_fedex_connection_settings(
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin_user),
+    current_admin: CurrentUser = Depends(get_current_admin_user),
 ):
     settings = _get_or_create_fedex_settings(db)
     if not settings.api_key or not settings.secret_key:
@@ -554,10 +661,10 @@ async def test_fedex_connection_settings(
 
 
 @app.get("/tracking/fedex/{tracking_number}")
-async def get_fedex_tracking(
+def get_fedex_tracking(
     tracking_number: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     normalized = (tracking_number or "").strip()
     if not normalized:
@@ -580,10 +687,74 @@ async def get_fedex_tracking(
 
 # ============ ENDPOINTS DE SHIPMENTS ============
 
+# Cache del JSON de GET /shipments; se invalida con cada alta/cambio/baja.
+# La generación evita guardar una lectura que empezó antes de una invalidación.
+SHIPMENTS_CACHE_TTL_SECONDS = 60
+_SHIPMENT_LIST_ADAPTER = TypeAdapter(List[ShipmentResponse])
+# Los listados leen filas planas con solo las columnas de la respuesta:
+# sin InstanceState, identity map ni validadores del ORM por fila
+_SHIPMENT_LIST_COLUMNS = tuple(getattr(Shipment, name) for name in ShipmentResponse.model_fields)
+# "entry" guarda (body, etag, expires_at) como una tupla para leerla de forma atómica
+_shipments_cache = {"entry": None, "generation": 0}
+# Serializa invalidación y guardado: los handlers corren en el threadpool
+_shipments_cache_lock = threading.Lock()
+# Sin Redis el cache es opt-in: SHIPMENTS_CACHE=1 solo es seguro con un único
+# worker, porque cada proceso invalida únicamente su propio cache
+SHIPMENTS_CACHE_WITHOUT_REDIS = os.getenv("SHIPMENTS_CACHE", "0") == "1"
+
+def _shipments_cache_enabled() -> bool:
+    """El cache por worker solo es coherente si las invalidaciones llegan a todos."""
+    if app.state.redis is not None:
+        return app.state.ws_relay_subscribed
+    return SHIPMENTS_CACHE_WITHOUT_REDIS
+
+def _shipment_list_response(shipments) -> Response:
+    """Serializar con el adapter compartido; al devolver un Response, FastAPI
+    no vuelve a validar la lista contra response_model (que queda para /docs)."""
+    body = _SHIPMENT_LIST_ADAPTER.dump_json(
+        _SHIPMENT_LIST_ADAPTER.validate_python(shipments, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
+
+def invalidate_shipments_cache():
+    with _shipments_cache_lock:
+        _shipments_cache["generation"] += 1
+        _shipments_cache["entry"] = None
+
+def _shipments_etag(body: bytes) -> str:
+    # Derivado del contenido: válido entre workers sin estado compartido
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
 @app.get("/shipments", response_model=List[ShipmentResponse])
-async def get_shipments(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_shipments(
+    request: Request,
+    limit: int | None = Query(None, ge=1, le=1000),
+    cursor: int | None = Query(None, description="Return shipments with id greater than this value"),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    if limit is not None or cursor is not None:
+        # Paginación por keyset sobre la PK; sin parámetros se devuelve todo (cacheado)
+        query = db.query(*_SHIPMENT_LIST_COLUMNS)
+        if cursor is not None:
+            query = query.filter(Shipment.id > cursor)
+        query = query.order_by(Shipment.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return _shipment_list_response(query.all())
+
+    if_none_match = request.headers.get("if-none-match")
+    cache_enabled = _shipments_cache_enabled()
+    entry = _shipments_cache["entry"] if cache_enabled else None
+    if entry is not None and entry[2] > time.monotonic():
+        body, etag, _expires_at = entry
+        if if_none_match == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+    generation = _shipments_cache["generation"]
     started_at = time.perf_counter()
-    shipments = db.query(Shipment).all()
+    shipments = db.query(*_SHIPMENT_LIST_COLUMNS).all()
     elapsed_ms = (time.perf_counter() - started_at) * 1000
     shipped_count = sum(1 for shipment in shipments if str(getattr(shipment, "shipped", "") or "").strip())
     avg_notes_len = 0.0
@@ -597,13 +768,52 @@ async def get_shipments(db: Session = Depends(get_db), current_user: User = Depe
         avg_notes_len,
         elapsed_ms,
     )
-    return shipments
+    response = _shipment_list_response(shipments)
+    etag = _shipments_etag(response.body)
+    if cache_enabled:
+        # Comprobar y guardar bajo el mismo lock que invalidate_shipments_cache:
+        # si hubo una escritura desde que empezó la consulta, no se guarda
+        with _shipments_cache_lock:
+            if _shipments_cache["generation"] == generation:
+                _shipments_cache["entry"] = (
+                    response.body,
+                    etag,
+                    time.monotonic() + SHIPMENTS_CACHE_TTL_SECONDS,
+                )
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return response
+
+class ShipmentSummary(BaseModel):
+    id: int
+    job_number: str
+    job_name: str
+    week: str
+    status: str
+    ship_plan: str
+    shipped: str
+    version: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+_SHIPMENT_SUMMARY_ADAPTER = TypeAdapter(List[ShipmentSummary])
+_SHIPMENT_SUMMARY_COLUMNS = tuple(getattr(Shipment, name) for name in ShipmentSummary.model_fields)
+
+@app.get("/shipments/summary", response_model=List[ShipmentSummary])
+def get_shipments_summary(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
+    """Listado liviano: sin las columnas de texto largas (notas, descripción, dirección)"""
+    shipments = db.query(*_SHIPMENT_SUMMARY_COLUMNS).all()
+    body = _SHIPMENT_SUMMARY_ADAPTER.dump_json(
+        _SHIPMENT_SUMMARY_ADAPTER.validate_python(shipments, from_attributes=True)
+    )
+    return Response(content=body, media_type="application/json")
 
 @app.get("/shipments/{shipment_id}", response_model=ShipmentResponse)
-async def get_shipment_by_id(
+def get_shipment_by_id(
     shipment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Obtener un shipment específico por ID"""
     shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
@@ -618,14 +828,16 @@ def clean_job_number(job_number: str) -> str:
 
 
 @app.post("/shipments", response_model=ShipmentResponse)
-async def create_shipment(
+def create_shipment(
     shipment: ShipmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
     """Crear nuevo shipment con validación robusta y manejo de duplicados"""
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    # Preparar datos una sola vez; el mismo dict sirve para el ORM y el log
+    shipment_data = shipment.model_dump()
+    # Limpiar job_number (permitir duplicados)
+    shipment_data["job_number"] = clean_job_number(shipment.job_number)
 
     # Retry para manejar conflictos de concurrencia
     max_retries = 3
@@ -635,13 +847,6 @@ async def create_shipment(
         try:
             logger.info(f"Creating shipment attempt {attempt + 1}: {shipment.job_number}")
 
-            # Limpiar job_number (permitir duplicados)
-            clean_job_number_value = clean_job_number(shipment.job_number)
-
-            # Preparar datos con validación
-            shipment_data = shipment.dict()
-            shipment_data["job_number"] = clean_job_number_value
-
             # Crear shipment - las validaciones se ejecutan automáticamente
             try:
                 new_shipment = Shipment(
@@ -671,11 +876,11 @@ async def create_shipment(
                 raise HTTPException(status_code=400, detail=str(e))
 
             db.commit()
-            db.refresh(new_shipment)
+            invalidate_shipments_cache()
 
             # Notificar via WebSocket (fuera de la transacción)
             try:
-                await manager.broadcast(json.dumps({
+                publish_event_from_thread(orjson.dumps({
                     "type": "shipment_created",
                     "data": {
                         "id": new_shipment.id,
@@ -696,7 +901,7 @@ async def create_shipment(
             if "duplicate key" in error_msg or "unique constraint" in error_msg:
                 if attempt < max_retries - 1:
                     # Esperar un poco antes de reintentar
-                    await asyncio.sleep(0.1 * (attempt + 1))
+                    time.sleep(0.1 * (attempt + 1))
                     logger.warning(f"Duplicate key on attempt {attempt + 1}, retrying...")
                     continue
                 else:
@@ -716,7 +921,7 @@ async def create_shipment(
             logger.error(f"Database error on attempt {attempt + 1}: {e}")
 
             if attempt < max_retries - 1:
-                await asyncio.sleep(0.2 * (attempt + 1))
+                time.sleep(0.2 * (attempt + 1))
                 continue
             else:
                 break
@@ -732,8 +937,86 @@ async def create_shipment(
     raise HTTPException(status_code=500, detail="Unable to create shipment due to persistent database issues")
 
 
+MAX_BULK_SHIPMENTS = 500
+
+
+@app.post("/shipments/bulk", response_model=List[ShipmentResponse])
+def create_shipments_bulk(
+    shipments: List[ShipmentCreate],
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(require_write)
+):
+    """Crear varios shipments en una sola transacción y un solo broadcast"""
+    if not shipments:
+        return []
+    if len(shipments) > MAX_BULK_SHIPMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_SHIPMENTS} shipments per request",
+        )
+
+    rows = []
+    for shipment in shipments:
+        shipment_data = shipment.model_dump()
+        shipment_data["job_number"] = clean_job_number(shipment.job_number)
+        rows.append(shipment_data)
+    # Copia para la base; rows conserva los valores recibidos para el log
+    insert_rows = [
+        {
+            **shipment_data,
+            "created_by": current_user.id,
+            "last_modified_by": current_user.id,
+            "version": 1,
+        }
+        for shipment_data in rows
+    ]
+
+    try:
+        # Validadores del modelo + un solo INSERT ... RETURNING
+        new_shipments = Shipment.bulk_insert(db, insert_rows)
+
+        log_rows = [
+            {
+                "shipment_id": new_shipment.id,
+                "changed_by": current_user.id,
+                "action": "create",
+                "field_name": field_name,
+                "old_value": "",
+                "new_value": _safe_text(value),
+            }
+            for new_shipment, shipment_data in zip(new_shipments, rows)
+            for field_name, value in shipment_data.items()
+            if value not in (None, "")
+        ]
+        if log_rows:
+            db.execute(insert(ShippingLog), log_rows)
+
+        db.commit()
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"Database error creating shipments in bulk: {e}")
+        raise HTTPException(status_code=500, detail="Unable to create shipments")
+    invalidate_shipments_cache()
+
+    try:
+        publish_event_from_thread(orjson.dumps({
+            "type": "shipments_bulk",
+            "data": {
+                "ids": [new_shipment.id for new_shipment in new_shipments],
+                "action_by": current_user.username
+            }
+        }))
+    except Exception as e:
+        logger.warning(f"Failed to broadcast bulk shipment creation: {e}")
+
+    return new_shipments
+
+
 @app.put("/shipments/{shipment_id}", response_model=ShipmentResponse)
-async def update_shipment(
+def update_shipment(
     shipment_id: int,
     shipment_update: ShipmentUpdate,
     current_version: int | None = Query(
@@ -741,12 +1024,9 @@ async def update_shipment(
         description="Current version for optimistic locking (optional for legacy clients)",
     ),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
     """Actualizar shipment con control de concurrencia optimista"""
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
     try:
         logger.info(f"Updating shipment {shipment_id}, version {current_version}")
 
@@ -772,7 +1052,7 @@ async def update_shipment(
                 )
 
         # Aplicar cambios con validación
-        update_data = shipment_update.dict(exclude_unset=True)
+        update_data = shipment_update.model_dump(exclude_unset=True)
         changes_made = {}
 
         for field, new_value in update_data.items():
@@ -804,8 +1084,7 @@ async def update_shipment(
             db.rollback()
             return shipment
 
-        # Actualizar metadatos de versión
-        shipment.version += 1
+        # Actualizar metadatos (version lo incrementa el mapper en el UPDATE)
         shipment.last_modified_by = current_user.id
         shipment.updated_at = datetime.utcnow()
 
@@ -817,8 +1096,19 @@ async def update_shipment(
             changes=changes_made,
         )
 
-        logger.info(f"Successfully updated shipment {shipment_id} to version {shipment.version}")
+        # version, updated_at y last_modified_by se asignan en el flush
         db.commit()
+        invalidate_shipments_cache()
+        logger.info(f"Successfully updated shipment {shipment_id} to version {shipment.version}")
+
+    except StaleDataError:
+        # Otro usuario actualizó la fila entre la lectura y el UPDATE
+        db.rollback()
+        logger.warning(f"Version conflict updating shipment {shipment_id}")
+        raise HTTPException(
+            status_code=409,
+            detail="Shipment was modified by another user. Please refresh and try again."
+        )
 
     except IntegrityError as e:
         db.rollback()
@@ -842,18 +1132,14 @@ async def update_shipment(
         logger.error(f"Unexpected error updating shipment {shipment_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-    # Refresh datos después del commit
-    db.refresh(shipment)
-
     # Notificar cambios
     try:
-        await manager.broadcast(json.dumps({
+        publish_event_from_thread(orjson.dumps({
             "type": "shipment_updated",
             "data": {
                 "id": shipment.id,
                 "job_number": shipment.job_number,
                 "version": shipment.version,
-                "changes": list(changes_made.keys()),
                 "action_by": current_user.username
             }
         }))
@@ -864,13 +1150,11 @@ async def update_shipment(
 
 
 @app.delete("/shipments/{shipment_id}")
-async def delete_shipment(
+def delete_shipment(
     shipment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
     shipment = db.query(Shipment).filter(Shipment.id == shipment_id).first()
     if not shipment:
         raise HTTPException(status_code=404, detail="Shipment not found")
@@ -906,18 +1190,30 @@ async def delete_shipment(
         changes=shipping_changes,
     )
     db.delete(shipment)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError:
+        # El DELETE también lleva "AND version = :v": la fila cambió mientras tanto
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Shipment was modified by another user. Please refresh and try again."
+        )
+    invalidate_shipments_cache()
+
+    # 🔔 Notificar eliminación (fuera de la transacción)
+    try:
+        publish_event_from_thread(orjson.dumps({
+            "type": "shipment_deleted",
+            "data": {
+                "id": shipment_id,
+                "job_number": job_number,
+                "action_by": current_user.username
+            }
+        }))
+    except Exception as e:
+        logger.warning(f"Failed to broadcast shipment deletion: {e}")
 
-    # 🔔 Notificar eliminación
-    await manager.broadcast(json.dumps({
-        "type": "shipment_deleted",
-        "data": {
-            "id": shipment_id,
-            "job_number": job_number,
-            "action_by": current_user.username
-        }
-    }))
-    
     return {"message": "Shipment deleted successfully"}
 
 
@@ -943,9 +1239,26 @@ async def startup_event():
     create_tables()
     print("👤 Configurando usuario admin...")
     create_admin_user()
+    if REDIS_URL:
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed; broadcasting locally")
+        else:
+            app.state.redis = aioredis.from_url(REDIS_URL)
+            app.state.ws_relay = asyncio.create_task(_ws_relay(app.state.redis))
+            print("🔁 Difusión WebSocket vía Redis habilitada")
     print("✅ Servidor listo en http://localhost:8000")
     print("📡 WebSocket disponible en ws://localhost:8000/ws")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    relay = app.state.ws_relay
+    if relay is not None:
+        relay.cancel()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
+
 @app.get("/")
 async def root():
     return {
@@ -957,28 +1270,49 @@ async def root():
 
 
 @app.get("/audit-logs")
-async def get_audit_logs(limit: int = Query(100), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    logs = db.query(AuditLog).order_by(AuditLog.timestamp.desc()).limit(limit).all()
+def get_audit_logs(
+    limit: int = Query(100, ge=1, le=1000),
+    before_timestamp: datetime | None = Query(None),
+    before_id: int | None = Query(None),
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    if (before_timestamp is None) != (before_id is None):
+        # Con uno solo se devolvería la primera página otra vez (bucle en el cliente)
+        raise HTTPException(
+            status_code=400,
+            detail="before_timestamp and before_id must be provided together",
+        )
+
+    # Solo el username del usuario: un LEFT JOIN sin hidratar objetos User
+    query = db.query(AuditLog, User.username).outerjoin(User, AuditLog.user_id == User.id)
+    if before_timestamp is not None:
+        # Keyset: continuar después del último (timestamp, id) recibido
+        query = query.filter(
+            tuple_(AuditLog.timestamp, AuditLog.id) < tuple_(before_timestamp, before_id)
+        )
+    rows = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(limit).all()
     return [
         {
-            "user": log.user.username if log.user else "Unknown",
+            "id": log.id,
+            "user": username or "Unknown",
             "action": log.action,
             "table_name": log.table_name,
             "record_id": log.record_id,
             "changes": log.changes,
             "timestamp": log.timestamp.isoformat()
         }
-        for log in logs
+        for log, username in rows
     ]    
 
 
 @app.get("/shipping-logs", response_model=List[ShippingLogResponse])
-async def get_shipping_logs(
+def get_shipping_logs(
     start_date: date | None = Query(None, description="Start date in YYYY-MM-DD format"),
     end_date: date | None = Query(None, description="End date in YYYY-MM-DD format"),
     limit: int = Query(1000, ge=1, le=5000),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     today = datetime.utcnow().date()
     effective_end_date = end_date or today
@@ -990,8 +1324,22 @@ async def get_shipping_logs(
     start_dt = datetime.combine(effective_start_date, datetime.min.time())
     end_dt = datetime.combine(effective_end_date + timedelta(days=1), datetime.min.time())
 
-    logs = (
-        db.query(ShippingLog)
+    # Filas planas en una sola consulta: sin objetos ORM ni lazy-load de User
+    rows = (
+        db.query(
+            ShippingLog.id,
+            ShippingLog.shipment_id,
+            Shipment.job_number,
+            ShippingLog.changed_by,
+            User.username,
+            ShippingLog.action,
+            ShippingLog.field_name,
+            ShippingLog.old_value,
+            ShippingLog.new_value,
+            ShippingLog.changed_at,
+        )
+        .outerjoin(Shipment, ShippingLog.shipment_id == Shipment.id)
+        .outerjoin(User, ShippingLog.changed_by == User.id)
         .filter(ShippingLog.changed_at >= start_dt)
         .filter(ShippingLog.changed_at < end_dt)
         .order_by(ShippingLog.changed_at.desc())
@@ -999,46 +1347,37 @@ async def get_shipping_logs(
         .all()
     )
 
-    shipment_ids = {log.shipment_id for log in logs if log.shipment_id is not None}
-    shipments_by_id = {}
-    if shipment_ids:
-        shipments = db.query(Shipment.id, Shipment.job_number).filter(Shipment.id.in_(shipment_ids)).all()
-        shipments_by_id = {shipment.id: shipment.job_number for shipment in shipments}
-
     return [
         ShippingLogResponse(
-            id=log.id,
-            shipment_id=log.shipment_id,
-            job_number=shipments_by_id.get(log.shipment_id, ""),
-            changed_by=log.changed_by,
-            username=log.user.username if log.user else "Unknown",
-            action=log.action,
-            field_name=log.field_name,
-            old_value=log.old_value or "",
-            new_value=log.new_value or "",
-            changed_at=log.changed_at,
+            id=row.id,
+            shipment_id=row.shipment_id,
+            job_number=row.job_number or "",
+            changed_by=row.changed_by,
+            username=row.username or "Unknown",
+            action=row.action,
+            field_name=row.field_name,
+            old_value=row.old_value or "",
+            new_value=row.new_value or "",
+            changed_at=row.changed_at,
         )
-        for log in logs
+        for row in rows
     ]
 
 
 # ============ ENDPOINTS DE SILLS ============
 
 @app.get("/sills", response_model=List[SillResponse])
-async def get_sills(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_sills(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     return db.query(Sill).order_by(Sill.id.desc()).all()
 
 
 @app.post("/sills", response_model=SillResponse)
-async def create_sill(
+def create_sill(
     sill: SillCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
-    sill_data = {k: _safe_text(v).strip() for k, v in sill.dict().items()}
+    sill_data = {k: _safe_text(v).strip() for k, v in sill.model_dump().items()}
     new_sill = Sill(
         **sill_data,
         created_by=current_user.id,
@@ -1066,20 +1405,17 @@ async def create_sill(
 
 
 @app.put("/sills/{sill_id}", response_model=SillResponse)
-async def update_sill(
+def update_sill(
     sill_id: int,
     sill_update: SillUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
     sill = db.query(Sill).filter(Sill.id == sill_id).first()
     if not sill:
         raise HTTPException(status_code=404, detail="Sill not found")
 
-    update_data = sill_update.dict(exclude_unset=True)
+    update_data = sill_update.model_dump(exclude_unset=True)
     changes_made = {}
     for field, raw_value in update_data.items():
         new_value = _safe_text(raw_value).strip()
@@ -1106,14 +1442,11 @@ async def update_sill(
 
 
 @app.delete("/sills/{sill_id}")
-async def delete_sill(
+def delete_sill(
     sill_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(require_write)
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
     sill = db.query(Sill).filter(Sill.id == sill_id).first()
     if not sill:
         raise HTTPException(status_code=404, detail="Sill not found")
@@ -1148,12 +1481,12 @@ async def delete_sill(
 
 
 @app.get("/sills-logs", response_model=List[SillLogResponse])
-async def get_sills_logs(
+def get_sills_logs(
     start_date: date | None = Query(None, description="Start date in YYYY-MM-DD format"),
     end_date: date | None = Query(None, description="End date in YYYY-MM-DD format"),
     limit: int = Query(1000, ge=1, le=5000),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     today = datetime.utcnow().date()
     effective_end_date = end_date or today
@@ -1205,20 +1538,17 @@ def _validate_sill_die_payload(payload: dict) -> dict:
 
 
 @app.get("/sills/dies", response_model=List[SillDieResponse])
-async def get_sill_dies(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_sill_dies(db: Session = Depends(get_db), current_user: CurrentUser = Depends(get_current_user)):
     return db.query(SillDieDatabase).order_by(SillDieDatabase.die_number.asc()).all()
 
 
 @app.post("/sills/dies", response_model=SillDieResponse)
-async def create_sill_die(
+def create_sill_die(
     die_data: SillDieCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(require_write),
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
-    payload = _validate_sill_die_payload(die_data.dict())
+    payload = _validate_sill_die_payload(die_data.model_dump())
     new_die = SillDieDatabase(
         **payload,
         created_by=current_user.id,
@@ -1235,20 +1565,17 @@ async def create_sill_die(
 
 
 @app.put("/sills/dies/{die_id}", response_model=SillDieResponse)
-async def update_sill_die(
+def update_sill_die(
     die_id: int,
     die_update: SillDieUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(require_write),
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
     die = db.query(SillDieDatabase).filter(SillDieDatabase.id == die_id).first()
     if not die:
         raise HTTPException(status_code=404, detail="Die not found")
 
-    payload = {k: _safe_text(v).strip() for k, v in die_update.dict(exclude_unset=True).items()}
+    payload = {k: _safe_text(v).strip() for k, v in die_update.model_dump(exclude_unset=True).items()}
     if "type" in payload and payload["type"] and payload["type"] not in {"Car", "Hatch", "Extension"}:
         raise HTTPException(status_code=400, detail="Type must be Car, Hatch, or Extension")
     if "speed" in payload and payload["speed"] and payload["speed"] not in {"0", "1", "2", "3"}:
@@ -1271,14 +1598,11 @@ async def update_sill_die(
 
 
 @app.delete("/sills/dies/{die_id}")
-async def delete_sill_die(
+def delete_sill_die(
     die_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(require_write),
 ):
-    if current_user.role not in ["write", "admin"]:
-        raise HTTPException(status_code=403, detail="Insufficient permissions")
-
     die = db.query(SillDieDatabase).filter(SillDieDatabase.id == die_id).first()
     if not die:
         raise HTTPException(status_code=404, detail="Die not found")
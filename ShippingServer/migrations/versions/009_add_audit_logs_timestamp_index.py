@@ -0,0 +1,24 @@
+"""Add audit logs timestamp index
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_audit_logs_timestamp_id ON audit_logs (timestamp DESC, id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_timestamp_id")
@@ -0,0 +1,34 @@
+"""Store audit log changes as JSONB
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE audit_logs
+        ALTER COLUMN changes TYPE JSONB
+        USING NULLIF(changes, '')::jsonb
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE audit_logs
+        ALTER COLUMN changes TYPE TEXT
+        USING changes::text
+        """
+    )
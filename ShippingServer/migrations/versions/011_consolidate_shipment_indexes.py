@@ -0,0 +1,34 @@
+"""Consolidate shipment indexes
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Duplicado de ix_shipment_job_number creado por index=True
+    op.execute("DROP INDEX IF EXISTS ix_shipments_job_number")
+    # Ninguna consulta filtra solo por version; ix_shipment_id_version cubre el lock
+    op.execute("DROP INDEX IF EXISTS ix_shipment_version")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_shipment_status_updated_id ON shipments (status, updated_at, id)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_shipment_status_updated")
+
+
+def downgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_shipment_status_updated ON shipments (status, updated_at)"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_shipment_status_updated_id")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_shipment_version ON shipments (version)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_shipments_job_number ON shipments (job_number)")
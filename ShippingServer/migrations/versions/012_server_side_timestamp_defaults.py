@@ -0,0 +1,36 @@
+"""Server-side timestamp defaults
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = (
+    ("users", "created_at"),
+    ("shipments", "created_at"),
+    ("shipments", "updated_at"),
+    ("audit_logs", "timestamp"),
+    ("shipping_logs", "changed_at"),
+    ("sills_logs", "changed_at"),
+)
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT timezone('utc', now())"
+        )
+
+
+def downgrade() -> None:
+    for table, column in _COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
@@ -1,12 +1,60 @@
 ﻿# models.py - Estructura de la base de datos
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Boolean, text
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, Boolean, insert, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 import re
+import string
+import time
 
 Base = declarative_base()
 
+# Timestamp UTC calculado por PostgreSQL en el INSERT (equivale a datetime.utcnow)
+_UTC_NOW = text("timezone('utc', now())")
+
+_EMPTY_DATE_VALUES = frozenset({'', 'n/a', 'na', 'null', 'none', 'pending', 'tbd'})
+_DATE_RE = re.compile(r'^([0-9]{1,2})([/-])([0-9]{1,2})\2([0-9]{2}|[0-9]{4})$')
+_VALID_STATUSES = ('final_release', 'partial_release', 'rejected', 'prod_updated')
+_VALID_STATUS_SET = frozenset(_VALID_STATUSES)
+_TEXT_MAX_LENGTHS = {
+    'description': 1000,
+    'qc_notes': 1000,
+    'shipping_notes': 1000,
+    'address': 1000,
+}
+_INVOICE_ALLOWED_CHARS = frozenset(string.ascii_letters + string.digits + '-.')
+
+# Año actual, refrescado como mucho una vez por hora
+_CURRENT_YEAR_TTL_SECONDS = 3600
+_current_year_cache = [datetime.now().year, time.monotonic() + _CURRENT_YEAR_TTL_SECONDS]
+
+
+def _current_year() -> int:
+    if time.monotonic() >= _current_year_cache[1]:
+        _current_year_cache[0] = datetime.now().year
+        _current_year_cache[1] = time.monotonic() + _CURRENT_YEAR_TTL_SECONDS
+    return _current_year_cache[0]
+
+
+def _parse_date(date_str: str) -> datetime | None:
+    """Parsear MM/DD/YY(YY) o MM-DD-YY(YY) sin strptime; None si no es válida."""
+    # Mismo separador en ambos lados, como los formatos de strptime originales
+    match = _DATE_RE.match(date_str)
+    if not match:
+        return None
+    year_str = match.group(4)
+    year = int(year_str)
+    if len(year_str) == 2:
+        # Mismo pivote que %y de strptime
+        year += 2000 if year < 69 else 1900
+    try:
+        return datetime(year, int(match.group(1)), int(match.group(3)))
+    except ValueError:
+        # Día/mes inexistente
+        return None
+
+
 class User(Base):
     __tablename__ = "users"
     
@@ -15,7 +63,7 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     role = Column(String(20), default="read")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
     is_active = Column(String(10), default="active")
     
     # Relación con shipments
@@ -33,18 +81,17 @@ class Shipment(Base):
         # Índice para performance (sin restricción única)
         Index('ix_shipment_job_number', 'job_number'),
         
-        # Índices para control de concurrencia
+        # Índice para control de concurrencia (id + version)
         Index('ix_shipment_id_version', 'id', 'version'),
-        Index('ix_shipment_version', 'version'),
         
         # Índices para consultas frecuentes
-        Index('ix_shipment_status_updated', 'status', 'updated_at'),
+        Index('ix_shipment_status_updated_id', 'status', 'updated_at', 'id'),
         Index('ix_shipment_created_by', 'created_by'),
         Index('ix_shipment_last_modified', 'last_modified_by'),
     )
     
     id = Column(Integer, primary_key=True, index=True)
-    job_number = Column(String(20), index=True, nullable=False)
+    job_number = Column(String(20), nullable=False)
     job_name = Column(String(200), nullable=False)
     week = Column(String(20))
     description = Column(Text)
@@ -66,13 +113,16 @@ class Shipment(Base):
     
     # Metadata
     created_by = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
+    updated_at = Column(DateTime, server_default=_UTC_NOW, onupdate=datetime.utcnow)
 
     # Control de concurrencia
     version = Column(Integer, default=1, nullable=False)
     last_modified_by = Column(Integer, ForeignKey("users.id"))
     last_modified_user = relationship("User", foreign_keys=[last_modified_by])
+
+    # El ORM incrementa version y agrega "AND version = :old" a cada UPDATE/DELETE
+    __mapper_args__ = {"version_id_col": version}
     
     # Relaciones
     created_by_user = relationship(
@@ -81,6 +131,23 @@ class Shipment(Base):
         foreign_keys=[created_by],
     )
 
+    @classmethod
+    def bulk_insert(cls, session, rows: list[dict]) -> list["Shipment"]:
+        """Insertar varios shipments en un solo INSERT ... RETURNING.
+
+        Los validadores se aplican a cada dict antes del INSERT porque la
+        ruta de Core no pasa por los eventos de atributo del ORM.
+        """
+        validators = cls.__mapper__.validators
+        for row in rows:
+            for key, (validator, _opts) in validators.items():
+                if key in row:
+                    row[key] = validator(None, key, row[key])
+        return session.scalars(
+            insert(cls).returning(cls, sort_by_parameter_order=True),
+            rows,
+        ).all()
+
     # ============ VALIDADORES DE DATOS ============
 
     @validates('job_number')
@@ -90,7 +157,7 @@ class Shipment(Base):
             raise ValueError("Job number is required")
         
         cleaned = str(value).strip()
-        base_number = cleaned.split('.')[0]  # Remover sufijos
+        base_number = cleaned.partition('.')[0]  # Remover sufijos
         
         if not base_number.isdigit():
             raise ValueError("Job number must be numeric (with optional decimal suffix)")
@@ -128,28 +195,14 @@ class Shipment(Base):
         date_str = str(value).strip()
         
         # Valores que se consideran vacíos
-        empty_values = ['', 'n/a', 'na', 'null', 'none', 'pending', 'tbd']
-        if date_str.lower() in empty_values:
+        if date_str.lower() in _EMPTY_DATE_VALUES:
             return ""
         
-        # Validar formato de fecha
-        valid_formats = ['%m/%d/%y', '%m/%d/%Y', '%m-%d-%y', '%m-%d-%Y']
-        
-        for fmt in valid_formats:
-            try:
-                # Intentar parsear la fecha
-                parsed_date = datetime.strptime(date_str, fmt)
-                
-                # Validar que la fecha sea razonable
-                current_year = datetime.now().year
-                if parsed_date.year < 1990 or parsed_date.year > current_year + 10:
-                    raise ValueError(f"Invalid year in {key}: {parsed_date.year}")
-                
-                # Devolver en formato consistente MM/DD/YY
-                return parsed_date.strftime('%m/%d/%y')
-                
-            except ValueError:
-                continue
+        parsed_date = _parse_date(date_str)
+        # Validar que la fecha sea razonable
+        if parsed_date is not None and 1990 <= parsed_date.year <= _current_year() + 10:
+            # Devolver en formato consistente MM/DD/YY
+            return f"{parsed_date.month:02d}/{parsed_date.day:02d}/{parsed_date.year % 100:02d}"
         
         raise ValueError(f"Invalid date format for {key}: '{date_str}'. Use MM/DD/YY, MM/DD/YYYY, MM-DD-YY, or MM-DD-YYYY")
 
@@ -163,10 +216,8 @@ class Shipment(Base):
         if not cleaned:
             return ""
 
-        valid_statuses = ['final_release', 'partial_release', 'rejected', 'prod_updated']
-
-        if cleaned not in valid_statuses:
-            raise ValueError(f"Invalid status: '{value}'. Must be one of: {', '.join(valid_statuses)}")
+        if cleaned not in _VALID_STATUS_SET:
+            raise ValueError(f"Invalid status: '{value}'. Must be one of: {', '.join(_VALID_STATUSES)}")
 
         return cleaned
 
@@ -179,14 +230,7 @@ class Shipment(Base):
         cleaned = str(value).strip()
         
         # Validar longitud según el campo
-        max_lengths = {
-            'description': 1000,
-            'qc_notes': 1000,
-            'shipping_notes': 1000,
-            'address': 1000
-        }
-        
-        max_length = max_lengths.get(key, 500)
+        max_length = _TEXT_MAX_LENGTHS.get(key, 500)
         
         if len(cleaned) > max_length:
             raise ValueError(f"{key.replace('_', ' ').title()} too long (max {max_length} characters)")
@@ -207,7 +251,7 @@ class Shipment(Base):
             raise ValueError(f"{field_name} too long (max {max_length} characters)")
         
         # Validar caracteres (permitir alfanuméricos, guiones y puntos)
-        if not re.match(r'^[a-zA-Z0-9\-\.]*$', cleaned):
+        if not _INVOICE_ALLOWED_CHARS.issuperset(cleaned):
             field_name = "Invoice number" if key == "invoice_number" else "Tracking number"
             raise ValueError(f"{field_name} contains invalid characters (only letters, numbers, hyphens, and dots allowed)")
         
@@ -218,14 +262,18 @@ class Shipment(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+
+    __table_args__ = (
+        Index("ix_audit_logs_timestamp_id", text("timestamp DESC"), text("id DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     action = Column(String(20))  # create, update, delete
     table_name = Column(String(50))
     record_id = Column(Integer)
-    changes = Column(Text)  # JSON string with changes
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    changes = Column(JSONB)  # Dict con los cambios, almacenado como JSONB
+    timestamp = Column(DateTime, server_default=_UTC_NOW)
     
     # Relación
     user = relationship("User")
@@ -246,7 +294,7 @@ class ShippingLog(Base):
     field_name = Column(String(100), nullable=False)
     old_value = Column(Text, default="")
     new_value = Column(Text, default="")
-    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    changed_at = Column(DateTime, server_default=_UTC_NOW, nullable=False)
     module = Column(String(30), nullable=False, default="shipping", server_default="shipping")
 
     user = relationship("User", foreign_keys=[changed_by])
@@ -304,7 +352,7 @@ class SillLog(Base):
     field_name = Column(String(100), nullable=False)
     old_value = Column(Text, default="")
     new_value = Column(Text, default="")
-    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    changed_at = Column(DateTime, server_default=_UTC_NOW, nullable=False)
     module = Column(String(30), nullable=False, default="sills", server_default="sills")
 
     user = relationship("User", foreign_keys=[changed_by])
@@ -0,0 +1,78 @@
+import types
+
+import pytest
+
+import auth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_verify(monkeypatch):
+    """Replace bcrypt with a counting fake; 'secret' is the only valid password."""
+    calls = []
+
+    def verify(plain_password, hashed_password):
+        calls.append((plain_password, hashed_password))
+        return plain_password == "secret"
+
+    monkeypatch.setattr(auth, "pwd_context", types.SimpleNamespace(verify=verify))
+    monkeypatch.setattr(auth, "_verify_cache", {})
+    return calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(auth, "time", fake)
+    return fake
+
+
+def test_failed_verification_is_never_cached(fake_verify, clock):
+    assert auth.verify_password("wrong", "hash") is False
+    assert auth.verify_password("wrong", "hash") is False
+
+    assert len(fake_verify) == 2
+    assert auth._verify_cache == {}
+
+
+def test_successful_verification_is_cached_until_ttl(fake_verify, clock):
+    assert auth.verify_password("secret", "hash") is True
+    clock.now += auth.VERIFY_CACHE_TTL_SECONDS - 1
+    assert auth.verify_password("secret", "hash") is True
+    assert len(fake_verify) == 1
+
+    clock.now += 1
+    assert auth.verify_password("secret", "hash") is True
+    assert len(fake_verify) == 2
+
+
+def test_expired_entry_does_not_outlive_password_change(fake_verify, clock):
+    assert auth.verify_password("secret", "old-hash") is True
+    clock.now += auth.VERIFY_CACHE_TTL_SECONDS
+
+    # Tras expirar, una contraseña ya no válida vuelve a pasar por bcrypt
+    auth.pwd_context.verify = lambda plain, hashed: False
+    assert auth.verify_password("secret", "old-hash") is False
+    assert auth._verify_cache == {}
+
+
+def test_cache_is_bounded(fake_verify, clock, monkeypatch):
+    monkeypatch.setattr(auth, "VERIFY_CACHE_MAX_ENTRIES", 3)
+
+    for index in range(10):
+        assert auth.verify_password("secret", f"hash-{index}") is True
+        assert len(auth._verify_cache) <= 3
+
+    # El más antiguo se descarta primero
+    cached_hashes = {hashed for hashed, _digest in auth._verify_cache}
+    assert cached_hashes == {"hash-7", "hash-8", "hash-9"}
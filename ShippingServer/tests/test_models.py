@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from models import _parse_date
+
+
+def _strptime_parse(value):
+    """Referencia: el bucle de strptime que reemplaza _parse_date."""
+    for fmt in ("%m/%d/%y", "%m/%d/%Y", "%m-%d-%y", "%m-%d-%Y"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def test_parse_date_matches_strptime():
+    samples = [
+        f"{month}{sep_a}{day}{sep_b}{year}"
+        for month in ("0", "1", "01", "2", "12", "13")
+        for day in ("0", "1", "01", "28", "29", "30", "31", "32")
+        for year in ("00", "24", "68", "69", "99", "024", "1990", "2024", "2100")
+        for sep_a, sep_b in (("/", "/"), ("-", "-"), ("/", "-"))
+    ]
+    samples += ["", "tbd", "1/2", "1/2/3", "a/b/cd", "2/29/23", "2/29/24"]
+
+    for value in samples:
+        assert _parse_date(value) == _strptime_parse(value), value
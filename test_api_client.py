@@ -1,9 +1,28 @@
+import socket
+
+import pytest
+
 from ShippingClient.core.api_client import RobustApiClient
 
 
-def test_api_client():
+def _no_dns(*args, **kwargs):
+    raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+
+@pytest.fixture(autouse=True)
+def fast_dns(monkeypatch):
+    # Fallar la resolución al instante en vez de esperar al resolver del sistema
+    monkeypatch.setattr(socket, "getaddrinfo", _no_dns)
+
+
+@pytest.fixture(scope="module")
+def client():
+    # Sin reintentos: cada reintento duerme 1s, 2s, 3s...
+    return RobustApiClient("http://invalid-server:9999", "fake-token", max_retries=0)
+
+
+def test_api_client(client):
     # Test con servidor inválido (debe manejar error gracefully)
-    client = RobustApiClient("http://invalid-server:9999", "fake-token")
     response = client.get_shipments()
 
     print(f"Success: {response.success}")
@@ -17,7 +36,7 @@ def test_api_client():
 
 def test_api_client_without_token():
     """El cliente debe poder inicializarse sin token para el login"""
-    client = RobustApiClient("http://invalid-server:9999")
+    client = RobustApiClient("http://invalid-server:9999", max_retries=0)
     response = client.login("user", "pass")
 
     print(f"Success: {response.success}")
@@ -30,4 +49,4 @@ def test_api_client_without_token():
 
 
 if __name__ == "__main__":
-    test_api_client()
+    test_api_client(RobustApiClient("http://invalid-server:9999", "fake-token", max_retries=0))
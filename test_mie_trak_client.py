@@ -1,20 +1,25 @@
 import sys
 import types
 
+import pytest
 
-def test_suffix_is_trimmed(monkeypatch):
+
+@pytest.fixture
+def mie_trak(monkeypatch):
+    """Return (mie_trak_client, executed) backed by a fake pymssql connection."""
     executed = []
+    row = {
+        "ShippingAddress1": "Addr1",
+        "ShippingAddressCity": "City",
+        "ShippingAddressStateDescription": "ST",
+        "ShippingAddressZipCode": "12345",
+    }
 
     class DummyCursor:
         def execute(self, query, params):
-            executed.append(params[0])
+            executed.append(params)
         def fetchone(self):
-            return {
-                "ShippingAddress1": "Addr1",
-                "ShippingAddressCity": "City",
-                "ShippingAddressStateDescription": "ST",
-                "ShippingAddressZipCode": "12345",
-            }
+            return row
 
     class DummyConn:
         def cursor(self, as_dict=True):
@@ -23,9 +28,32 @@ def test_suffix_is_trimmed(monkeypatch):
             pass
 
     dummy_pymssql = types.SimpleNamespace(connect=lambda *args, **kwargs: DummyConn())
-    sys.modules["pymssql"] = dummy_pymssql
+    monkeypatch.setitem(sys.modules, "pymssql", dummy_pymssql)
     from ShippingClient.core import mie_trak_client
+    monkeypatch.setattr(mie_trak_client, "pymssql", dummy_pymssql)
+    mie_trak_client.invalidate_mie_trak_address_cache()
+    return mie_trak_client, executed
+
+
+def test_suffix_is_trimmed(mie_trak):
+    mie_trak_client, executed = mie_trak
 
     address = mie_trak_client.get_mie_trak_address("12345.1")
-    assert executed[0] == "12345"
+    assert executed[0][0] == "12345"
+    # El último parámetro es el del ORDER BY que prioriza la coincidencia exacta
+    assert executed[0][-1] == "12345"
+    assert len(executed) == 1
     assert "Addr1" in address
+
+
+def test_address_is_cached(mie_trak):
+    mie_trak_client, executed = mie_trak
+
+    first = mie_trak_client.get_mie_trak_address("555")
+    second = mie_trak_client.get_mie_trak_address("555.2")
+    assert first == second
+    assert len(executed) == 1
+
+    mie_trak_client.invalidate_mie_trak_address_cache("555")
+    mie_trak_client.get_mie_trak_address("555")
+    assert len(executed) == 2